@@ -5,15 +5,81 @@ Assignment 1 Task 2: Draw a hollow square of a given size.
 
 Our Understanding: To draw a hollow square, we need to print asterisks (*) for the borders and spaces for the inner part of the square.
 """
+import mmap
+import sys
+from typing import Optional, TextIO
+
+# Approximate number of characters handed to the stream per write call
+BLOCK_SIZE = 1 << 20
+
+# Function to build the two distinct rows of a hollow square
+def squareRows(size: int) -> tuple:
+    border = "* " * size + "\n"
+    if size <= 2:
+        return border, border
+    interior = "* " + "  " * (size - 2) + "* " + "\n"
+    return border, interior
+
 # Function to draw a hollow square of given size 
-def drawSquare(size: int) -> None:
-    for row in range(size):
-        for col in range(size):
-            if row in (0, size - 1) or col in (0, size - 1):
-                print("*", end=" ")
-            else:
-                print(" ", end=" ")
-        print()
+def drawSquare(size: int, stream: Optional[TextIO] = None) -> None:
+    """
+    Writes the square to stream (stdout by default). The border and interior
+    rows are built once and the interior rows are written in large blocks
+    instead of one print per cell.
+    """
+    if size <= 0:
+        return
+    stream = sys.stdout if stream is None else stream
+    border, interior = squareRows(size)
+
+    stream.write(border)
+    remaining = size - 2
+    if remaining > 0:
+        rowsInBlock = min(max(1, BLOCK_SIZE // len(interior)), remaining)
+        block = interior * rowsInBlock
+        while remaining >= rowsInBlock:
+            stream.write(block)
+            remaining -= rowsInBlock
+        stream.write(interior * remaining)
+    if size > 1:
+        stream.write(border)
+
+# Function to compute the size of a rendered square in bytes
+def squareBytes(size: int) -> int:
+    return max(size, 0) * (2 * max(size, 0) + 1)
+
+# Function to write a hollow square straight to a file, optionally through mmap
+def writeSquareFile(path: str, size: int, useMmap: bool = False) -> int:
+    """
+    Writes the square to path and returns the number of bytes written.
+    With useMmap the file is sized up front and the rows are copied into a
+    memory map, so the data never goes through Python's file buffering.
+    """
+    if not useMmap:
+        with open(path, "w", encoding="ascii", newline="\n") as f:
+            drawSquare(size, f)
+        return squareBytes(size)
+
+    border, interior = (row.encode("ascii") for row in squareRows(size))
+    total = squareBytes(size)
+    with open(path, "wb+") as f:
+        if total == 0:
+            return 0
+        f.truncate(total)
+        with mmap.mmap(f.fileno(), total) as mm:
+            mm[:len(border)] = border
+            offset = len(border)
+            rowsPerBlock = max(1, BLOCK_SIZE // len(interior))
+            block = interior * rowsPerBlock
+            remaining = max(size - 2, 0)
+            while remaining > 0:
+                chunk = block if remaining >= rowsPerBlock else interior * remaining
+                mm[offset:offset + len(chunk)] = chunk
+                offset += len(chunk)
+                remaining -= len(chunk) // len(interior)
+            if size > 1:
+                mm[offset:offset + len(border)] = border
+    return total
 
 # Function to get user input for the size of the square
 def getUserInput() -> int:
@@ -0,0 +1,60 @@
+# Group 24 Assignment 1 Task 2 - benchmark
+
+"""
+Throughput benchmark for the hollow square drawer.
+
+Writes squares of increasing size to the null device (and optionally to a
+temporary file through mmap) and reports rows per second. The original
+print-per-cell loop is timed too for the sizes where it finishes quickly.
+
+Usage: python bench_assignment1_task2.py [--sizes 10 100 1000 10000 100000] [--mmap]
+"""
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+
+from assignment1_task2 import drawSquare, writeSquareFile
+
+# The original implementation, kept as the baseline
+def legacyDrawSquare(size: int) -> None:
+    for row in range(size):
+        for col in range(size):
+            if row in (0, size - 1) or col in (0, size - 1):
+                print("*", end=" ")
+            else:
+                print(" ", end=" ")
+        print()
+
+# Function to time one call and return rows per second
+def rowsPerSecond(func, size: int) -> float:
+    start = time.perf_counter()
+    func()
+    return size / max(time.perf_counter() - start, 1e-9)
+
+def main():
+    parser = argparse.ArgumentParser(description="Hollow square throughput benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000, 100000])
+    parser.add_argument("--legacy-max-size", type=int, default=1000,
+                        help="largest size to run the print-per-cell baseline on")
+    parser.add_argument("--mmap", action="store_true", help="also time writeSquareFile with mmap")
+    args = parser.parse_args()
+
+    print(f"{'size':>8}{'legacy rows/s':>16}{'buffered rows/s':>18}{'mmap rows/s':>14}")
+    with open(os.devnull, "w") as devnull, tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            legacy = "-"
+            if size <= args.legacy_max_size:
+                with contextlib.redirect_stdout(devnull):
+                    legacy = f"{rowsPerSecond(lambda: legacyDrawSquare(size), size):.0f}"
+            buffered = rowsPerSecond(lambda: drawSquare(size, devnull), size)
+            mapped = "-"
+            if args.mmap:
+                path = os.path.join(tmp, "square.txt")
+                mapped = f"{rowsPerSecond(lambda: writeSquareFile(path, size, useMmap=True), size):.0f}"
+                os.remove(path)
+            print(f"{size:>8}{legacy:>16}{buffered:>18.0f}{mapped:>14}")
+
+if __name__ == "__main__":
+    main()
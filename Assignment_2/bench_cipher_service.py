@@ -0,0 +1,120 @@
+"""
+Load generator for the Question 1 cipher service.
+
+Starts cipher_service.py in a child process on a temporary Unix socket (or
+uses an already running one), then opens --clients connections that each
+send --requests encrypt/decrypt/verify jobs of --size-kb random text, and
+reports p50/p99 latency per job, jobs per second and MB/s.
+
+The first reply on every connection is checked against question_1's
+bytes.translate tables and decrypted again to give the original back.
+
+Usage:
+    python bench_cipher_service.py [--clients 1 8 64] [--requests 50]
+                                   [--size-kb 64] [--max-jobs 64]
+                                   [--unix PATH]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import cipher_service
+import question_1
+
+def make_bodies(count, size, seed=137):
+    """count random ASCII/Unicode text bodies of about size bytes each."""
+    rng = random.Random(seed)
+    pool = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ     .,;!?\r\né漢"
+    return ["".join(rng.choice(pool) for _ in range(size)).encode("utf-8")[:size]
+            for _ in range(count)]
+
+async def _client(unix, bodies, requests, shift1, shift2, latencies):
+    reader, writer = await cipher_service.open_client(unix)
+    try:
+        schedule = question_1.get_key_schedule(shift1, shift2)
+        for i in range(requests):
+            body = bodies[i % len(bodies)]
+            op = cipher_service.OPS[i % 3]
+            start = time.perf_counter()
+            if op == "verify":
+                result = await cipher_service.call(reader, writer, op, shift1, shift2,
+                                                   body + body, split=len(body))
+                if result is not True:
+                    raise AssertionError("verify of identical halves reported a mismatch")
+            else:
+                result = await cipher_service.call(reader, writer, op, shift1, shift2, body)
+            latencies.append(time.perf_counter() - start)
+            if i == 0:
+                if result != body.translate(schedule.enc_bytes):
+                    raise AssertionError("service output differs from question_1")
+                back = await cipher_service.call(reader, writer, "decrypt", shift1, shift2, result)
+                if back != body:
+                    raise AssertionError("decrypt did not restore the original")
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+async def run_load(unix, clients, requests, size, shift1=3, shift2=5):
+    """
+    Runs `clients` concurrent connections of `requests` jobs each.
+    Returns (latencies in seconds, wall-clock seconds).
+    """
+    bodies = make_bodies(8, size)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(unix, bodies, requests, shift1, shift2, latencies)
+                           for _ in range(clients)))
+    return latencies, time.perf_counter() - start
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+def start_server(path, max_jobs):
+    """Starts cipher_service.py on path in a child process and waits for the socket."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen([sys.executable, os.path.join(here, "cipher_service.py"),
+                             "--unix", path, "--max-jobs", str(max_jobs)],
+                            stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 10
+    while not os.path.exists(path):
+        if proc.poll() is not None or time.monotonic() > deadline:
+            proc.kill()
+            raise RuntimeError("cipher service did not start")
+        time.sleep(0.02)
+    return proc
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 64])
+    parser.add_argument("--requests", type=int, default=50, help="jobs per client")
+    parser.add_argument("--size-kb", type=int, default=64, help="body size per job")
+    parser.add_argument("--max-jobs", type=int, default=cipher_service.MAX_JOBS)
+    parser.add_argument("--unix", help="use an already running service on this socket")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        unix = args.unix or os.path.join(tmp, "cipher.sock")
+        proc = None if args.unix else start_server(unix, args.max_jobs)
+        try:
+            print(f"{'clients':>8}{'jobs':>8}{'p50 ms':>10}{'p99 ms':>10}{'jobs/s':>10}{'MB/s':>10}")
+            for clients in args.clients:
+                latencies, elapsed = asyncio.run(
+                    run_load(unix, clients, args.requests, args.size_kb * 1024))
+                jobs = len(latencies)
+                print(f"{clients:>8}{jobs:>8}{_percentile(latencies, 0.5) * 1000:>10.2f}"
+                      f"{_percentile(latencies, 0.99) * 1000:>10.2f}{jobs / elapsed:>10.0f}"
+                      f"{jobs * args.size_kb / 1024 / elapsed:>10.1f}")
+        finally:
+            if proc:
+                proc.terminate()
+                proc.wait()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""
+Helpers shared by the benchmark scripts (bench_question_*.py here and
+benchmarks.py at the repository root).
+"""
+
+import time
+
+# Peak RSS in MiB, NaN where the resource module is missing (Windows)
+from question_2 import peak_memory_mb  # noqa: F401
+
+class RecordingTurtle:
+    """
+    Stands in for turtle.Turtle: counts goto calls and, unless keep_points
+    is False, records their targets. Draws nothing.
+    """
+
+    def __init__(self, keep_points=True):
+        self.moves = 0
+        self.points = [] if keep_points else None
+
+    def goto(self, x, y=None):
+        self.moves += 1
+        if self.points is not None:
+            self.points.append((x, y) if y is not None else x)
+
+def timed(func, *args, **kwargs):
+    """Calls func(*args, **kwargs); returns (result, elapsed seconds)."""
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
@@ -0,0 +1,132 @@
+"""
+Throughput benchmark for the Question 1 shift cipher.
+
+Encrypts a synthetic text file with each cipher mode and reports MB/s and
+the peak resident memory (RSS) of the process that did the work. Every mode
+runs in its own fresh child process so peak RSS figures do not leak between
+runs.
+
+Before timing anything, the engines are checked against the reference
+per-character loop over random shift pairs (negative and huge shifts
+included) and random ASCII/Unicode text.
+
+Usage:
+    python bench_question_1.py [size_mb] [--repeat N] [--parity-only]
+"""
+
+import argparse
+import contextlib
+import io
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+
+import question_1
+from bench_common import peak_memory_mb
+
+# mode name -> keyword arguments for encrypt_file
+MODES = {
+    "loop whole-file": {"chunk_size": None, "engine": "loop"},
+    "loop streaming": {"engine": "loop"},
+    "translate": {"engine": "translate"},
+    "bytes": {"engine": "bytes"},
+}
+
+def _random_text(rng, length):
+    pool = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ 0123456789.,\t\né—Ωß漢🙂"
+    return "".join(rng.choice(pool) for _ in range(length))
+
+def _random_shift(rng):
+    return rng.choice([
+        rng.randint(-30, 30),
+        rng.randint(-10**6, 10**6),
+        rng.randint(-10**18, 10**18),
+    ])
+
+def _run_engine(engine, text, shift1, shift2, decrypt=False):
+    run = question_1.decrypt_file if decrypt else question_1.encrypt_file
+    if engine == "bytes":
+        src, dst = io.BytesIO(text.encode("utf-8")), io.BytesIO()
+    else:
+        src, dst = io.StringIO(text), io.StringIO()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if not run(src, dst, shift1, shift2, chunk_size=97, engine=engine):
+            raise RuntimeError(f"{engine} engine failed for shifts ({shift1}, {shift2})")
+    out = dst.getvalue()
+    return out.decode("utf-8") if engine == "bytes" else out
+
+def check_parity(trials=200, seed=137):
+    """
+    Checks every engine against the reference loop in both directions and
+    that decryption round-trips. Raises AssertionError on the first mismatch.
+    """
+    rng = random.Random(seed)
+    for _ in range(trials):
+        shift1, shift2 = _random_shift(rng), _random_shift(rng)
+        text = _random_text(rng, rng.randint(0, 500))
+        expected = _run_engine("loop", text, shift1, shift2)
+        for engine in question_1.ENGINES:
+            encrypted = _run_engine(engine, text, shift1, shift2)
+            assert encrypted == expected, f"{engine} encrypt differs for ({shift1}, {shift2})"
+            decrypted = _run_engine(engine, encrypted, shift1, shift2, decrypt=True)
+            assert decrypted == text, f"{engine} round trip differs for ({shift1}, {shift2})"
+    return trials
+
+def make_corpus(path, size_mb, seed=137):
+    """Writes roughly size_mb MiB of letters, spaces and punctuation to path."""
+    rng = random.Random(seed)
+    alphabet = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ     .,;!?\n"
+    block = "".join(rng.choice(alphabet) for _ in range(1 << 16))
+    with open(path, "w", encoding="utf-8") as f:
+        for _ in range(size_mb * 16):
+            f.write(block)
+
+def _run_mode(args):
+    mode, src, dst, shift1, shift2 = args
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        ok = question_1.encrypt_file(src, dst, shift1, shift2, **MODES[mode])
+    elapsed = time.perf_counter() - start
+    return ok, elapsed, peak_memory_mb()
+
+def run_benchmark(size_mb, repeat=1, shift1=3, shift2=5):
+    """Returns a list of (mode, MB/s, peak RSS MiB) rows."""
+    ctx = multiprocessing.get_context("spawn")
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "corpus.txt")
+        make_corpus(src, size_mb)
+        size = os.path.getsize(src) / (1 << 20)
+        for mode in MODES:
+            best = None
+            for _ in range(repeat):
+                dst = os.path.join(tmp, f"{mode}.txt")
+                with ctx.Pool(1) as pool:
+                    ok, elapsed, rss = pool.apply(_run_mode, ((mode, src, dst, shift1, shift2),))
+                if not ok:
+                    raise RuntimeError(f"encryption failed in mode {mode}")
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, rss)
+            rows.append((mode, size / best[0], best[1]))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("size_mb", nargs="?", type=int, default=64)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--parity-only", action="store_true")
+    args = parser.parse_args()
+
+    print(f"Parity: {check_parity()} random shift pairs match the reference loop")
+    if args.parity_only:
+        return
+
+    print(f"Encrypting a {args.size_mb} MiB corpus")
+    print(f"{'mode':<18}{'MB/s':>10}{'peak RSS MiB':>16}")
+    for mode, rate, rss in run_benchmark(args.size_mb, args.repeat):
+        print(f"{mode:<18}{rate:>10.2f}{rss:>16.1f}")
+
+if __name__ == "__main__":
+    main()
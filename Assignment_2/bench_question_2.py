@@ -0,0 +1,236 @@
+"""
+Timing benchmark for the Question 2 temperature analysis.
+
+Builds synthetic temperature archives scaled to several multiples of the
+shipped temperatures/ folder (each extra "year" is a jittered copy of a real
+year file, with a few values blanked to NaN) and times ingestion plus the
+three analyses for the streaming aggregator against the original iterrows
+loader. Both must produce identical report lines.
+
+Usage:
+    python bench_question_2.py [--scales 1 10 100] [--skip-legacy-above 10]
+                               [--workers 2 4 8] [--binary] [--index]
+                               [--big-file-mb 5120 --budget-mb 64 --rss-limit-mb 512]
+"""
+
+import argparse
+import glob
+import multiprocessing
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+import question_2
+from bench_common import timed
+
+def make_archive(folder, scale, source=question_2.DATA_FOLDER, nan_fraction=0.01, seed=137):
+    """
+    Writes scale x len(source files) synthetic year files into folder.
+    Returns (paths, total station rows).
+    """
+    rng = np.random.default_rng(seed)
+    sources = sorted(glob.glob(os.path.join(source, "*.csv")))
+    paths = []
+    rows = 0
+    for i in range(scale * len(sources)):
+        df = pd.read_csv(sources[i % len(sources)])
+        temps = df[question_2.MONTH_COLUMNS].to_numpy(dtype=float)
+        temps = np.round(temps + rng.normal(0, 0.5, temps.shape), 2)
+        temps[rng.random(temps.shape) < nan_fraction] = np.nan
+        df[question_2.MONTH_COLUMNS] = temps
+        path = os.path.join(folder, f"stations_group_{1000 + i}.csv")
+        df.to_csv(path, index=False)
+        paths.append(path)
+        rows += len(df)
+    return paths, rows
+
+def legacy_ingest(csv_files):
+    """The original iterrows/dict-append loader, kept as the baseline."""
+    month_numbers = {month: i + 1 for i, month in enumerate(question_2.MONTH_COLUMNS)}
+    station_data = {}
+    all_records = []
+    for file in csv_files:
+        df = pd.read_csv(file)
+        for _, row in df.iterrows():
+            station = row["STATION_NAME"]
+            temps = row[question_2.MONTH_COLUMNS].values.astype(float)
+            station_data.setdefault(station, []).extend(temps)
+            for month, temp in zip(question_2.MONTH_COLUMNS, temps):
+                if pd.notna(temp):
+                    all_records.append({"Station": station, "Month": month_numbers[month],
+                                        "Temperature": temp})
+    return station_data, pd.DataFrame(all_records)
+
+def legacy_report(csv_files):
+    station_data, all_df = legacy_ingest(csv_files)
+    lines = []
+    for season, months in question_2.SEASON_MAPPING.items():
+        lines.append(f"{season}: {all_df[all_df['Month'].isin(months)]['Temperature'].mean():.1f}")
+    stds = {}
+    for station, temps in station_data.items():
+        temps = [t for t in temps if pd.notna(t)]
+        if temps:
+            lines.append(f"{station} {max(temps):.1f} {min(temps):.1f}")
+        stds[station] = pd.Series(temps).std() if len(temps) > 1 else 0.0
+        lines.append(f"{station} {stds[station]:.3f}")
+    return lines
+
+def streaming_report(csv_files, workers=1):
+    aggregator = question_2.aggregate_files(csv_files, workers)
+    lines = [f"{season}: {avg:.1f}" for season, avg in aggregator.seasonal_averages().items()]
+    ranges = aggregator.station_ranges()
+    for station, std in aggregator.station_std().items():
+        if station in ranges:
+            lines.append(f"{station} {ranges[station]['max']:.1f} {ranges[station]['min']:.1f}")
+        lines.append(f"{station} {std:.3f}")
+    return lines
+
+def _load_all(args):
+    files, use_binary = args
+    baseline = question_2.peak_memory_mb()
+    start = time.perf_counter()
+    frames = list(question_2.iter_temperature_frames(files, use_binary))
+    # Touch every value so mapped pages count as loaded
+    total = sum(float(df[question_2.MONTH_COLUMNS].sum().sum()) for df in frames)
+    return time.perf_counter() - start, question_2.peak_memory_mb() - baseline, total
+
+def compare_load(files):
+    """
+    Loads files from CSV and from their columnar copies, each in a fresh
+    process. Returns {"csv"|"binary": (seconds, peak RSS growth MiB)}.
+    """
+    question_2.convert_archive(files)
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    for label, use_binary in (("csv", False), ("binary", True)):
+        with ctx.Pool(1) as pool:
+            elapsed, rss, _ = pool.apply(_load_all, ((files, use_binary),))
+        results[label] = (elapsed, rss)
+    return results
+
+def bench_index(folder, queries=10000, seed=137):
+    """
+    Builds a StationYearIndex over folder and times random per-station
+    year-range queries, checking a sample against a full re-aggregation.
+    Returns (build seconds, mean query microseconds).
+    """
+    dataset = question_2.TemperatureDataset(folder)
+
+    index, build_time = timed(lambda: dataset.index)
+    rng = np.random.default_rng(seed)
+    years = dataset.years
+    jobs = []
+    for _ in range(queries):
+        station = index.stations[rng.integers(len(index.stations))]
+        first, last = sorted(rng.choice(years, 2))
+        jobs.append((station, int(first), int(last)))
+
+    start = time.perf_counter()
+    for station, first, last in jobs:
+        index.query(station, first, last)
+    query_time = (time.perf_counter() - start) / queries * 1e6
+
+    for station, first, last in jobs[:50]:
+        expected = dataset.aggregate(years=(first, last), stations=[station]).stations.get(station)
+        got = index.query(station, first, last)
+        if expected is None or expected.count == 0:
+            assert got is None
+        else:
+            assert got["count"] == expected.count and abs(got["std"] - expected.std) < 1e-6
+    return build_time, query_time
+
+def make_big_csv(path, size_mb, stations=5000, source=question_2.DATA_FOLDER, seed=137):
+    """
+    Writes one CSV of roughly size_mb MiB: rows of the real files relabelled
+    at random as one of `stations` synthetic stations.
+    """
+    rng = np.random.default_rng(seed)
+    frames = [pd.read_csv(f) for f in sorted(glob.glob(os.path.join(source, "*.csv")))]
+    base = pd.concat(frames, ignore_index=True)
+    with open(path, "w", newline="") as f:
+        base.iloc[:0].to_csv(f, index=False)
+        while f.tell() < size_mb * (1 << 20):
+            block = base.copy()
+            block["STATION_NAME"] = np.char.add(
+                "STATION-", rng.integers(stations, size=len(block)).astype(str))
+            block.to_csv(f, index=False, header=False)
+
+def _aggregate_big(args):
+    path, budget = args
+    start = time.perf_counter()
+    aggregator = question_2.aggregate_files([path], use_binary=False, memory_budget=budget)
+    return time.perf_counter() - start, question_2.peak_memory_mb(), len(aggregator.stations)
+
+def bench_big_file(size_mb, budget_mb, rss_limit_mb):
+    """
+    Aggregates one synthetic size_mb CSV in chunked mode in a fresh process.
+    Returns (seconds, peak RSS MiB, stations, within limit).
+    """
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "big.csv")
+        make_big_csv(path, size_mb)
+        with ctx.Pool(1) as pool:
+            elapsed, rss, stations = pool.apply(
+                _aggregate_big, ((path, int(budget_mb * (1 << 20))),))
+    return elapsed, rss, stations, rss <= rss_limit_mb
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--scales", type=int, nargs="*", default=[1, 10, 100])
+    parser.add_argument("--skip-legacy-above", type=int, default=10,
+                        help="don't run the slow legacy loader above this scale")
+    parser.add_argument("--workers", type=int, nargs="+", default=[],
+                        help="also time the parallel loader with these worker counts")
+    parser.add_argument("--binary", action="store_true",
+                        help="also compare CSV and columnar load time and memory")
+    parser.add_argument("--index", action="store_true",
+                        help="also time StationYearIndex build and queries")
+    parser.add_argument("--big-file-mb", type=int, default=0,
+                        help="also aggregate one synthetic CSV of this size in chunked mode")
+    parser.add_argument("--budget-mb", type=float, default=64,
+                        help="memory budget for --big-file-mb")
+    parser.add_argument("--rss-limit-mb", type=float, default=512,
+                        help="peak RSS the --big-file-mb run must stay under")
+    args = parser.parse_args()
+
+    if args.big_file_mb:
+        elapsed, rss, stations, ok = bench_big_file(args.big_file_mb, args.budget_mb,
+                                                    args.rss_limit_mb)
+        print(f"{args.big_file_mb} MiB CSV, {stations} stations, budget {args.budget_mb} MiB: "
+              f"{elapsed:.1f}s, {args.big_file_mb / elapsed:.1f} MiB/s, peak RSS {rss:.1f} MiB "
+              f"({'within' if ok else 'OVER'} the {args.rss_limit_mb:.0f} MiB limit)")
+
+    if args.scales:
+        print(f"{'scale':>6}{'files':>8}{'rows':>10}{'legacy s':>12}{'streaming s':>15}{'speedup':>10}")
+    for scale in args.scales:
+        with tempfile.TemporaryDirectory() as tmp:
+            files, rows = make_archive(tmp, scale)
+            new_lines, new_time = timed(streaming_report, files)
+            if scale <= args.skip_legacy_above:
+                old_lines, old_time = timed(legacy_report, files)
+                if old_lines != new_lines:
+                    raise AssertionError(f"streaming results differ from legacy at scale {scale}")
+                speedup = f"{old_time / new_time:.1f}x"
+                old_col = f"{old_time:.2f}"
+            else:
+                old_col = speedup = "-"
+            print(f"{scale:>6}{len(files):>8}{rows:>10}{old_col:>12}{new_time:>15.2f}{speedup:>10}")
+            for workers in args.workers:
+                lines, elapsed = timed(streaming_report, files, workers)
+                if lines != new_lines:
+                    raise AssertionError(f"{workers}-worker results differ at scale {scale}")
+                print(f"{'':>6}{workers:>8} workers: {elapsed:.2f}s "
+                      f"({new_time / elapsed:.1f}x vs. 1 worker)")
+            if args.binary:
+                for label, (elapsed, rss) in compare_load(files).items():
+                    print(f"{'':>6}{label:>8} load: {elapsed:.2f}s, +{rss:.1f} MiB RSS")
+            if args.index:
+                build, query = bench_index(tmp)
+                print(f"{'':>6}{'index':>8} build: {build * 1000:.1f} ms, query: {query:.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark for Question 3 Koch vertex generation.
+
+Times, for depths 1-10, the original recursive draw_koch_segment (driving a
+headless stand-in that records turtle.goto calls instead of drawing), the
+iterative koch_points generator and the NumPy koch_vertices backend in
+float64 and float32, and checks they produce the same vertices.
+
+Usage:
+    python bench_question_3.py [--sides 4] [--depths 1 2 ... 10]
+                               [--recursive-max-depth 10]
+"""
+
+import argparse
+
+import numpy as np
+
+import question_3
+from bench_common import RecordingTurtle, timed
+
+def recursive_points(sides, length, depth):
+    """Vertices produced by the original recursive drawing code."""
+    t = RecordingTurtle()
+    vertices = question_3.polygon_vertices(sides, length)
+    t.goto(vertices[0])
+    for i in range(sides):
+        x0, y0 = vertices[i]
+        x1, y1 = vertices[(i + 1) % sides]
+        question_3.draw_koch_segment(t, x0, y0, x1, y1, depth)
+    return t.points
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sides", type=int, default=4)
+    parser.add_argument("--length", type=float, default=300)
+    parser.add_argument("--depths", type=int, nargs="+", default=list(range(1, 11)))
+    parser.add_argument("--recursive-max-depth", type=int, default=10,
+                        help="skip the slow recursive and generator runs above this depth")
+    args = parser.parse_args()
+
+    print(f"{'depth':>5}{'vertices':>12}{'recursive s':>14}{'generator s':>14}"
+          f"{'numpy64 s':>12}{'numpy32 s':>12}{'MiB64':>8}{'MiB32':>8}")
+    for depth in args.depths:
+        fast, fast_time = timed(question_3.koch_vertices, args.sides, args.length, depth)
+        small, small_time = timed(question_3.koch_vertices, args.sides, args.length, depth,
+                                   dtype=np.float32)
+        if depth <= args.recursive_max_depth:
+            slow, slow_time = timed(recursive_points, args.sides, args.length, depth)
+            lazy, lazy_time = timed(lambda: list(question_3.koch_points(args.sides, args.length, depth)))
+            slow = np.asarray(slow)
+            tolerance = 1e-6 * args.length
+            if slow.shape != fast.shape or np.abs(slow - fast).max() > tolerance:
+                raise AssertionError(f"numpy vertices differ from recursive ones at depth {depth}")
+            if np.abs(np.asarray(lazy) - fast).max() > tolerance:
+                raise AssertionError(f"generator vertices differ at depth {depth}")
+            slow_col, lazy_col = f"{slow_time:.4f}", f"{lazy_time:.4f}"
+        else:
+            slow_col = lazy_col = "-"
+        print(f"{depth:>5}{len(fast):>12}{slow_col:>14}{lazy_col:>14}"
+              f"{fast_time:>12.4f}{small_time:>12.4f}"
+              f"{fast.nbytes / (1 << 20):>8.1f}{small.nbytes / (1 << 20):>8.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Start-up benchmark for the Question 1-3 scripts.
+
+For each script, runs `python -X importtime -c "import <module>"` in a fresh
+interpreter several times and reports the median import time and the
+heaviest imports it pulls in. It then times a few short command lines end to
+end (question_2 with no CSVs, question_3 --help) and times what a single
+question_1 run spends on its cipher tables: building the one key schedule it
+uses, from a cold cache.
+
+Usage:
+    python bench_startup.py [--runs 5] [--top 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import question_1
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MODULES = ("question_1", "question_2", "question_3")
+
+def import_profile(module):
+    """
+    One `-X importtime` run of `import module`.
+    Returns (total microseconds, {top-level import: cumulative microseconds}).
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=HERE, capture_output=True, text=True, check=True)
+    total, children = 0, {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # header row
+        depth = (len(name) - len(name.lstrip())) // 2
+        if name.strip() == module:
+            total = int(cumulative)
+        elif depth == 1:
+            children[name.strip()] = int(cumulative)
+    return total, children
+
+def time_command(args, cwd, runs):
+    """Median wall-clock seconds of running `python <args>` in cwd."""
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=cwd, capture_output=True, check=True)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+def time_first_key(runs, shift1=3, shift2=5):
+    """Median milliseconds to build the key schedule of (shift1, shift2) from a cold cache."""
+    times = []
+    for _ in range(runs):
+        question_1._compile_key_schedule.cache_clear()
+        start = time.perf_counter()
+        question_1.get_key_schedule(shift1, shift2)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="heaviest imports listed per module")
+    args = parser.parse_args()
+
+    print(f"{'module':<12}{'import ms':>10}  heaviest imports")
+    for module in MODULES:
+        # First run warms the bytecode cache
+        import_profile(module)
+        profiles = [import_profile(module) for _ in range(args.runs)]
+        total = statistics.median(p[0] for p in profiles) / 1000
+        children = profiles[-1][1]
+        heavy = sorted(children.items(), key=lambda item: item[1], reverse=True)[:args.top]
+        listed = ", ".join(f"{name} {us / 1000:.1f}" for name, us in heavy)
+        print(f"{module:<12}{total:>10.1f}  {listed}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.makedirs(os.path.join(tmp, "temperatures"))
+        commands = {
+            "question_2.py, no CSVs": [os.path.join(HERE, "question_2.py")],
+            "question_3.py --help": [os.path.join(HERE, "question_3.py"), "--help"],
+            "python -c pass": ["-c", "pass"],
+        }
+        print(f"\n{'command':<26}{'wall ms':>10}")
+        for label, command in commands.items():
+            print(f"{label:<26}{time_command(command, tmp, args.runs) * 1000:>10.1f}")
+
+    print(f"\nquestion_1 key schedule, cold: {time_first_key(max(args.runs, 100)):.3f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+HIT137 Assignment 2 - Question 1: Cipher service
+
+A long-lived asyncio server that runs encrypt, decrypt and verify jobs for
+the shift cipher over a Unix socket or a localhost TCP port, so callers do
+not pay interpreter start-up and the interactive prompt for every file.
+
+Protocol (one connection can carry any number of jobs, one after another):
+  request   one JSON line {"op": ..., "shift1": N, "shift2": M, "length": L}
+            followed by L body bytes. For "verify" the body is the original
+            followed by the decrypted text and the line also carries
+            "split": the length of the original.
+  response  one JSON line {"status": "ok", ...}. encrypt/decrypt responses
+            carry "length" and are followed by that many bytes; verify
+            responses carry "match". On a bad request the response is
+            {"status": "error", "error": ...} and the connection is closed.
+            If an encrypt/decrypt body breaks off (or stalls for
+            --read-timeout seconds) after the ok line has gone out, the
+            connection is closed with no error line, so the client sees a
+            short read instead of error text inside the output bytes.
+
+Bodies are raw bytes translated with the cached bytes.translate tables from
+question_1 (get_key_schedule), so line endings are passed through untouched,
+like the "bytes" engine. Bodies are streamed in chunks and never held in
+memory whole; each write waits for the socket to drain, so a slow reader
+throttles its own job only. At most --max-jobs jobs run at once.
+
+Usage:
+    python cipher_service.py --unix /tmp/cipher.sock [--max-jobs 64]
+    python cipher_service.py --port 8765 [--chunk-size 65536] [--write-buffer 262144]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+
+from question_1 import get_key_schedule
+
+OPS = ("encrypt", "decrypt", "verify")
+
+# Bytes read from the socket per step
+SERVICE_CHUNK_SIZE = 1 << 16
+
+# Jobs processed at the same time; further requests wait their turn
+MAX_JOBS = 64
+
+# Bytes buffered per connection before writes wait for the client to read
+WRITE_BUFFER = 1 << 18
+
+# Longest accepted request line
+MAX_HEADER = 1 << 12
+
+# Seconds a job waits for more body bytes before it is dropped
+READ_TIMEOUT = 30.0
+
+class ProtocolError(Exception):
+    """A malformed request; reported to the client, then the connection closes."""
+
+class JobAborted(Exception):
+    """A job failed after its ok line was sent; the connection just closes."""
+
+def parse_header(line):
+    """
+    Validates one request line. Returns (op, shift1, shift2, length, split).
+    Raises ProtocolError if anything is missing or out of range.
+    """
+    try:
+        header = json.loads(line)
+        op = header["op"]
+        shift1, shift2, length = int(header["shift1"]), int(header["shift2"]), int(header["length"])
+        split = int(header.get("split", 0))
+    except (ValueError, KeyError, TypeError, OverflowError) as e:
+        raise ProtocolError(f"bad request line: {e}") from None
+    if op not in OPS:
+        raise ProtocolError(f"unknown op {op!r}; expected one of {OPS}")
+    if length < 0 or not 0 <= split <= length:
+        raise ProtocolError("length and split must satisfy 0 <= split <= length")
+    return op, shift1, shift2, length, split
+
+async def _read_header_line(reader):
+    """One request line from reader; a line over the stream limit is a ProtocolError."""
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError) as e:
+        raise ProtocolError(f"request line too long: {e}") from None
+
+async def _read_body(reader, length, chunk_size, timeout=READ_TIMEOUT):
+    """
+    Yields exactly length bytes from reader in chunks of at most chunk_size.
+    Waiting more than timeout seconds for a chunk is a ProtocolError.
+    """
+    remaining = length
+    while remaining:
+        try:
+            chunk = await asyncio.wait_for(reader.read(min(chunk_size, remaining)), timeout)
+        except asyncio.TimeoutError:
+            raise ProtocolError(f"no body bytes for {timeout:g} s "
+                                f"with {remaining} still missing") from None
+        if not chunk:
+            raise ProtocolError(f"connection closed with {remaining} body bytes missing")
+        remaining -= len(chunk)
+        yield chunk
+
+async def _write_line(writer, message):
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+
+class CipherService:
+    """
+    Connection handler for asyncio.start_server / start_unix_server.
+    Counts completed jobs and bytes processed in `stats`.
+    """
+
+    def __init__(self, max_jobs=MAX_JOBS, chunk_size=SERVICE_CHUNK_SIZE,
+                 write_buffer=WRITE_BUFFER, read_timeout=READ_TIMEOUT):
+        self.chunk_size = chunk_size
+        self.write_buffer = write_buffer
+        self.read_timeout = read_timeout
+        self.slots = asyncio.Semaphore(max_jobs)
+        self.stats = {"jobs": 0, "errors": 0, "bytes": 0}
+
+    async def handle(self, reader, writer):
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        try:
+            while True:
+                try:
+                    line = await _read_header_line(reader)
+                    if not line:
+                        break
+                    async with self.slots:
+                        await self._run_job(parse_header(line), reader, writer)
+                except ProtocolError as e:
+                    self.stats["errors"] += 1
+                    await _write_line(writer, {"status": "error", "error": str(e)})
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, JobAborted):
+            self.stats["errors"] += 1
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _run_job(self, job, reader, writer):
+        op, shift1, shift2, length, split = job
+        schedule = get_key_schedule(shift1, shift2)
+        if op == "verify":
+            original, decrypted = hashlib.sha256(), hashlib.sha256()
+            seen = 0
+            async for chunk in _read_body(reader, length, self.chunk_size, self.read_timeout):
+                head = chunk[:max(0, split - seen)]
+                original.update(head)
+                decrypted.update(chunk[len(head):])
+                seen += len(chunk)
+            match = split * 2 == length and original.digest() == decrypted.digest()
+            await _write_line(writer, {"status": "ok", "match": match})
+        else:
+            table = schedule.enc_bytes if op == "encrypt" else schedule.dec_bytes
+            # bytes.translate keeps the length, so the header can go out first
+            await _write_line(writer, {"status": "ok", "length": length})
+            try:
+                async for chunk in _read_body(reader, length, self.chunk_size, self.read_timeout):
+                    writer.write(chunk.translate(table))
+                    await writer.drain()
+            except ProtocolError as e:
+                # An error line now would be read as part of the output bytes
+                raise JobAborted(str(e)) from None
+        self.stats["jobs"] += 1
+        self.stats["bytes"] += length
+
+async def start_service(service, unix=None, host="127.0.0.1", port=0):
+    """Starts listening; returns the asyncio Server."""
+    limit = max(MAX_HEADER, service.chunk_size)
+    if unix:
+        return await asyncio.start_unix_server(service.handle, path=unix, limit=limit)
+    return await asyncio.start_server(service.handle, host, port, limit=limit)
+
+# Client
+
+async def open_client(unix=None, host="127.0.0.1", port=0):
+    """Connects to a running service; returns (reader, writer)."""
+    if unix:
+        return await asyncio.open_unix_connection(unix)
+    return await asyncio.open_connection(host, port)
+
+async def call(reader, writer, op, shift1, shift2, body, split=0):
+    """
+    Sends one job over an open connection and waits for its result.
+    Returns the output bytes for encrypt/decrypt and a bool for verify.
+    Raises RuntimeError if the service reports an error.
+    """
+    header = {"op": op, "shift1": shift1, "shift2": shift2, "length": len(body), "split": split}
+    # Send and receive at the same time: the service streams its output back
+    # while the body is still arriving, and would stall if nobody read it
+    sending = asyncio.ensure_future(_send(writer, header, body))
+    try:
+        response = json.loads(await reader.readline())
+        if response["status"] != "ok":
+            raise RuntimeError(response["error"])
+        result = response["match"] if op == "verify" else await reader.readexactly(response["length"])
+        await sending
+    finally:
+        sending.cancel()
+    return result
+
+async def _send(writer, header, body):
+    writer.write(json.dumps(header).encode("utf-8") + b"\n")
+    view = memoryview(body)
+    for start in range(0, len(view), SERVICE_CHUNK_SIZE):
+        writer.write(view[start:start + SERVICE_CHUNK_SIZE])
+        await writer.drain()
+    await writer.drain()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Shift cipher service.")
+    where = parser.add_mutually_exclusive_group(required=True)
+    where.add_argument("--unix", metavar="PATH", help="listen on this Unix socket")
+    where.add_argument("--port", type=int, help="listen on this localhost TCP port")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--max-jobs", type=int, default=MAX_JOBS,
+                        help="jobs processed at the same time")
+    parser.add_argument("--chunk-size", type=int, default=SERVICE_CHUNK_SIZE,
+                        help="bytes read from a connection per step")
+    parser.add_argument("--write-buffer", type=int, default=WRITE_BUFFER,
+                        help="bytes buffered per connection before writes wait")
+    parser.add_argument("--read-timeout", type=float, default=READ_TIMEOUT,
+                        help="seconds a job waits for more body bytes before it is dropped")
+    return parser.parse_args(argv)
+
+async def serve(args):
+    service = CipherService(args.max_jobs, args.chunk_size, args.write_buffer,
+                            args.read_timeout)
+    if args.unix and os.path.exists(args.unix):
+        os.remove(args.unix)
+    server = await start_service(service, args.unix, args.host, args.port)
+    where = args.unix or f"{args.host}:{server.sockets[0].getsockname()[1]}"
+    print(f"Cipher service listening on {where} (max {args.max_jobs} jobs)")
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    try:
+        asyncio.run(serve(parse_args(argv)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
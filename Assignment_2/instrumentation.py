@@ -0,0 +1,205 @@
+"""
+HIT137 Assignment 2 - Opt-in timing and profiling for the question scripts.
+
+Everything here is off unless switched on, and then costs one attribute
+check per instrumented call. Enable it with the HIT137_PROFILE environment
+variable or a script's --profile flag, giving a comma-separated list of:
+    timers       - wall-clock time and call counts of the instrumented
+                   stages, plus counters (chunks, bytes, rows, ...)
+    cprofile     - a cProfile run over the whole script (top functions by
+                   cumulative time)
+    tracemalloc  - peak traced Python memory and the top allocation sites
+"1" or "all" turns on all three. At exit a JSON report is written to
+HIT137_PROFILE_REPORT / --profile-report, by default <script>_profile.json.
+
+Only the current process is measured: work done in worker processes
+(--workers) shows up as the time the parent spent waiting for it.
+
+Usage:
+    HIT137_PROFILE=timers python question_2.py
+    python question_2.py --profile timers,tracemalloc --profile-report q2.json
+"""
+
+import atexit
+import contextlib
+import functools
+import json
+import os
+import sys
+import time
+
+ENV_VAR = "HIT137_PROFILE"
+REPORT_ENV_VAR = "HIT137_PROFILE_REPORT"
+MODES = ("timers", "cprofile", "tracemalloc")
+
+# Rows kept in the cProfile and tracemalloc sections of the report
+TOP_N = 25
+
+class _State:
+    def __init__(self):
+        self.enabled = False
+        self.modes = ()
+        self.report = None
+        self.timers = {}     # name -> [calls, seconds]
+        self.counters = {}   # name -> total
+        self.profiler = None
+        self.started = None
+
+_state = _State()
+
+def parse_modes(spec):
+    """Turns "timers,cprofile" / "1" / "all" into a tuple of MODES."""
+    names = [name.strip().lower() for name in (spec or "").split(",") if name.strip()]
+    if any(name in ("1", "all", "true", "yes") for name in names):
+        return MODES
+    unknown = [name for name in names if name not in MODES]
+    if unknown:
+        raise ValueError(f"unknown profile mode(s) {unknown}; expected some of {MODES}")
+    return tuple(names)
+
+def configure(modes, report=None):
+    """
+    Switches instrumentation on for the given modes (a spec string or a
+    sequence) and registers the report to be written at exit. Calling it
+    again adds modes; an empty spec leaves instrumentation as it is.
+    """
+    if isinstance(modes, str):
+        modes = parse_modes(modes)
+    modes = tuple(m for m in modes if m not in _state.modes)
+    if report:
+        _state.report = report
+    if not modes:
+        return
+    if not _state.enabled:
+        _state.enabled = True
+        _state.started = time.perf_counter()
+        atexit.register(write_report)
+    _state.modes += modes
+    if "tracemalloc" in modes:
+        import tracemalloc
+        tracemalloc.start()
+    if "cprofile" in modes:
+        import cProfile
+        _state.profiler = cProfile.Profile()
+        _state.profiler.enable()
+
+def enabled():
+    return _state.enabled
+
+def add_arguments(parser):
+    """Adds --profile and --profile-report to an argparse parser."""
+    parser.add_argument("--profile", metavar="MODES", default="",
+                        help=f"comma-separated instrumentation modes: {', '.join(MODES)} or all")
+    parser.add_argument("--profile-report", metavar="PATH", default=None,
+                        help="where the JSON profile report is written")
+
+def configure_from_args(parser, args):
+    """Applies --profile/--profile-report; a bad mode is reported via parser.error."""
+    try:
+        configure(args.profile, args.profile_report)
+    except ValueError as e:
+        parser.error(str(e))
+
+# Timers and counters
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        entry = _state.timers.setdefault(self.name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += time.perf_counter() - self.start
+        return False
+
+_NULL_TIMER = contextlib.nullcontext()
+
+def timer(name):
+    """Context manager adding the time spent in its block to timer `name`."""
+    if _state.enabled:
+        return _Timer(name)
+    return _NULL_TIMER
+
+def timed(name):
+    """Decorator form of timer(): times every call of the function."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with _Timer(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def count(name, amount=1):
+    """Adds amount to counter `name`."""
+    if _state.enabled:
+        _state.counters[name] = _state.counters.get(name, 0) + amount
+
+# Report
+
+def _cprofile_rows(profiler):
+    import pstats
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (file, line, func), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        rows.append({"function": f"{os.path.basename(file)}:{line}({func})", "calls": calls,
+                     "tottime_s": round(tottime, 6), "cumtime_s": round(cumtime, 6)})
+    rows.sort(key=lambda row: row["cumtime_s"], reverse=True)
+    return rows[:TOP_N]
+
+def _tracemalloc_section():
+    import tracemalloc
+    current, peak = tracemalloc.get_traced_memory()
+    top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_N]
+    return {
+        "current_mb": round(current / (1 << 20), 3),
+        "peak_mb": round(peak / (1 << 20), 3),
+        "top": [{"where": str(stat.traceback[0]), "size_kb": round(stat.size / 1024, 1),
+                 "blocks": stat.count} for stat in top],
+    }
+
+def report():
+    """The current measurements as a JSON-serialisable dict."""
+    data = {
+        "script": os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else None,
+        "argv": sys.argv[1:],
+        "modes": list(_state.modes),
+        "wall_s": round(time.perf_counter() - _state.started, 6) if _state.started else 0.0,
+        "timers": {name: {"calls": calls, "seconds": round(seconds, 6)}
+                   for name, (calls, seconds) in sorted(_state.timers.items())},
+        "counters": dict(sorted(_state.counters.items())),
+    }
+    if _state.profiler is not None:
+        _state.profiler.disable()
+        data["cprofile"] = _cprofile_rows(_state.profiler)
+    if "tracemalloc" in _state.modes:
+        data["tracemalloc"] = _tracemalloc_section()
+    return data
+
+def write_report(path=None):
+    """Writes the JSON report (at most once per run). Returns its path."""
+    if not _state.enabled:
+        return None
+    _state.enabled = False
+    atexit.unregister(write_report)
+    script = os.path.splitext(os.path.basename(sys.argv[0] or "python"))[0] or "python"
+    path = path or _state.report or f"{script}_profile.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(), f, indent=2)
+    print(f"Profile report written to '{path}'.", file=sys.stderr)
+    return path
+
+if os.environ.get(ENV_VAR):
+    # A typo in the variable must not stop the program itself from running
+    try:
+        configure(os.environ[ENV_VAR], os.environ.get(REPORT_ENV_VAR))
+    except ValueError as e:
+        print(f"Warning: {ENV_VAR} ignored, instrumentation is off: {e}", file=sys.stderr)
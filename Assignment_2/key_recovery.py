@@ -0,0 +1,294 @@
+"""
+HIT137 Assignment 2 - Question 1: Shift recovery
+
+Recovers (shift1, shift2) for a file encrypted by question_1.py when the
+shifts are lost.
+
+Every shift in the cipher depends only on shift1 and shift2 mod 13, so there
+are at most 169 distinct effective keys however large the original shifts
+were. Each candidate is scored by the cross-entropy of its decryption under
+English letter-pair frequencies, in bits per letter (lower is better).
+
+Only a bounded prefix of the file is read, and its letters and letter pairs
+are counted once: decrypting with a candidate key only permutes those
+counts, so scoring a key never touches the text again. Candidates are scored
+in a process pool and the search stops as soon as one scores below the
+confidence threshold with no rival close to it.
+
+Usage:
+    python key_recovery.py encrypted_text.txt [--sample-bytes N] [--workers N]
+                                              [--top 5] [--decrypt OUT]
+"""
+
+import argparse
+import collections
+import concurrent.futures
+import math
+import os
+import sys
+
+from question_1 import decrypt_file, effective_key, get_key_schedule
+
+# Relative frequency (%) of each letter in English text
+ENGLISH_FREQUENCIES = {
+    "a": 8.167, "b": 1.492, "c": 2.782, "d": 4.253, "e": 12.702, "f": 2.228,
+    "g": 2.015, "h": 6.094, "i": 6.966, "j": 0.153, "k": 0.772, "l": 4.025,
+    "m": 2.406, "n": 6.749, "o": 7.507, "p": 1.929, "q": 0.095, "r": 5.987,
+    "s": 6.327, "t": 9.056, "u": 2.758, "v": 0.978, "w": 2.360, "x": 0.150,
+    "y": 1.974, "z": 0.074,
+}
+
+# How often each letter pair occurs inside English words, per 10,000 pairs:
+# ENGLISH_PAIRS[x] lists the counts of x followed by a, b, ..., z. Counted
+# from English prose (software licences and the Python reference manual).
+ENGLISH_PAIRS = {
+    "a": "0 28 42 15 0 3 12 0 29 0 7 107 42 152 0 16 0 117 81 154 15 10 3 3 17 0",
+    "b": "13 0 3 1 42 0 0 0 11 25 0 36 0 0 9 1 0 13 4 1 33 0 0 0 23 0",
+    "c": "48 0 9 0 95 0 0 42 21 0 11 40 0 0 101 1 0 11 1 80 24 0 0 0 1 0",
+    "d": "10 2 0 6 96 0 1 0 60 0 0 3 0 0 17 0 0 1 10 1 13 1 0 0 2 0",
+    "e": "34 4 77 121 25 31 9 2 10 0 0 32 40 149 1 29 16 200 130 57 0 16 8 57 15 0",
+    "f": "10 0 0 0 13 8 0 0 41 0 0 4 0 0 60 0 0 20 0 11 17 0 0 0 4 0",
+    "g": "7 0 0 0 37 0 2 13 12 0 0 5 1 11 2 1 0 15 5 2 12 0 0 0 0 0",
+    "h": "67 0 0 0 248 0 0 0 45 0 0 0 1 0 40 0 0 4 0 11 1 0 0 0 1 0",
+    "i": "18 37 77 19 28 47 25 0 1 0 2 33 27 231 125 10 0 18 134 120 1 21 0 2 0 4",
+    "j": "0 0 0 0 25 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 2 0 0 0 0 0",
+    "k": "1 0 0 0 19 0 0 0 4 0 0 0 0 1 0 1 0 0 4 0 1 0 0 0 0 0",
+    "l": "53 0 1 13 96 8 0 0 85 0 0 52 0 0 33 1 0 1 18 15 26 1 1 0 30 0",
+    "m": "52 11 0 0 102 0 0 0 15 0 0 0 8 1 27 32 0 0 11 2 12 0 0 0 0 0",
+    "n": "42 0 49 96 59 4 86 1 17 0 2 9 4 5 51 1 0 0 83 126 14 8 0 0 17 0",
+    "o": "2 28 18 46 4 83 9 0 5 0 3 17 39 204 9 36 0 160 19 54 61 18 19 1 1 1",
+    "p": "42 0 0 2 49 0 0 2 11 0 0 35 0 0 25 17 0 56 2 26 11 0 0 0 16 0",
+    "q": "0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 17 0 0 0 0 0",
+    "r": "81 2 11 14 172 2 16 0 86 0 13 2 28 18 53 5 0 20 39 25 10 2 3 0 23 0",
+    "s": "11 0 12 0 143 2 0 18 58 0 1 7 1 1 31 20 0 0 56 99 34 0 0 0 7 0",
+    "t": "70 1 4 1 156 1 0 341 155 0 0 8 2 1 82 2 0 60 43 26 19 0 10 0 27 0",
+    "u": "12 16 14 7 29 1 6 0 15 0 0 29 26 41 1 13 0 35 45 53 0 0 0 0 0 0",
+    "v": "30 0 0 0 63 0 0 0 15 0 0 0 0 0 3 0 0 0 0 0 0 0 0 0 0 0",
+    "w": "17 0 0 0 9 0 0 25 41 0 0 1 0 3 20 0 0 3 2 0 0 0 1 0 0 0",
+    "x": "5 0 16 0 10 0 0 0 4 0 0 0 0 0 0 13 0 0 0 9 0 0 0 1 1 0",
+    "y": "1 0 1 0 2 0 0 0 5 0 0 0 1 5 26 14 0 4 7 8 0 0 3 0 0 0",
+    "z": "1 0 0 0 4 0 0 0 1 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0 0",
+}
+
+# Bytes read from the start of the file (1 MiB is far more than enough)
+SAMPLE_BYTES = 1 << 20
+
+# A score at or below this is treated as a confident match and ends the search.
+# English text scores around 3.5-3.9 bits per letter; keys with the wrong lowercase
+# shifts score 4.5 or more. Keys differing only in capital shifts can score close
+# to the right one, which is what AMBIGUOUS_BITS is for.
+CONFIDENT_SCORE = 4.2
+
+# Fewer letters than this and no score is trustworthy (nor is an early exit taken)
+MIN_LETTERS = 200
+
+# Two candidates whose decryptions of the sample differ by fewer bits than this
+# in total (the better one less than 2**10 times as likely) are ambiguous
+AMBIGUOUS_BITS = 10.0
+
+def candidate_keys():
+    """
+    One (shift1, shift2, effective_key) per distinct effective key, with
+    shifts normalised to 0..12. Equivalent shift pairs are collapsed.
+    """
+    seen = {}
+    for shift1 in range(13):
+        for shift2 in range(13):
+            key = effective_key(shift1, shift2)
+            if key not in seen:
+                seen[key] = (shift1, shift2, key)
+    return list(seen.values())
+
+def candidate_groups():
+    """
+    Candidates grouped by their lowercase shifts. Members of a group (at most
+    two: (s1, s2) and (s2, s1) give the same lowercase shifts) only differ in
+    how they treat capitals, so they are always scored together; otherwise an
+    early exit could stop on the wrong member.
+    """
+    groups = {}
+    for candidate in candidate_keys():
+        groups.setdefault(candidate[2][:2], []).append(candidate)
+    return list(groups.values())
+
+def read_sample(path, sample_bytes=SAMPLE_BYTES):
+    """Reads at most sample_bytes from the start of path as raw bytes."""
+    with open(path, "rb") as f:
+        return f.read(sample_bytes)
+
+def _is_letter(code):
+    return 65 <= code <= 90 or 97 <= code <= 122
+
+def count_letters(sample):
+    """Counts each ASCII letter in a bytes sample. Returns {letter: count}."""
+    counts = collections.Counter(sample)
+    return {chr(code): count for code, count in counts.items() if _is_letter(code)}
+
+def count_pairs(sample):
+    """
+    Counts each pair of adjacent ASCII letters in a bytes sample.
+    Returns {(letter, next letter): count}.
+    """
+    counts = collections.Counter(zip(sample, sample[1:]))
+    return {(chr(a), chr(b)): count for (a, b), count in counts.items()
+            if _is_letter(a) and _is_letter(b)}
+
+def score_key(letter_counts, pair_counts, shift1, shift2):
+    """
+    Bits per letter needed to encode the decryption with (shift1, shift2).
+    A letter followed by another letter is scored by how likely its
+    decryption is to come before the decrypted next letter in English
+    (ENGLISH_PAIRS, case ignored); the last letter of each word is scored
+    under English letter frequencies. Pairs rather than single letters are
+    what tell the two keys of a candidate group apart: they only differ in
+    capital shifts, and a wrongly shifted capital is often just as common a
+    letter ("Puick" for "Quick") but rarely as likely before its neighbour.
+    """
+    table = get_key_schedule(shift1, shift2).dec_table
+    total = sum(letter_counts.values())
+    if total == 0:
+        return float("inf")
+    plain = {letter: letter.translate(table).lower() for letter in letter_counts}
+    unpaired = dict(letter_counts)
+    bits = 0.0
+    for (letter, after), count in pair_counts.items():
+        bits -= count * _LOG2_BEFORE[plain[letter], plain[after]]
+        unpaired[letter] -= count
+    for letter, count in unpaired.items():
+        bits -= count * _LOG2_FREQUENCIES[plain[letter]]
+    return bits / total
+
+_LOG2_FREQUENCIES = {letter: math.log2(percent / 100.0)
+                     for letter, percent in ENGLISH_FREQUENCIES.items()}
+
+def _before_table():
+    """{(x, y): log2 P(x | next letter is y)} from ENGLISH_PAIRS, with add-half smoothing."""
+    counts = {(x, y): int(count) + 0.5 for x, row in ENGLISH_PAIRS.items()
+              for y, count in zip(ENGLISH_FREQUENCIES, row.split())}
+    ending = collections.Counter()
+    for (_, y), count in counts.items():
+        ending[y] += count
+    return {(x, y): math.log2(count / ending[y]) for (x, y), count in counts.items()}
+
+_LOG2_BEFORE = _before_table()
+
+def _score_batch(job):
+    """Worker: scores one batch of candidates. Returns [(score, shift1, shift2)]."""
+    letter_counts, pair_counts, groups = job
+    return [(score_key(letter_counts, pair_counts, shift1, shift2), shift1, shift2)
+            for group in groups for shift1, shift2, _ in group]
+
+def _half(letter):
+    """Which half of the alphabet letter is in: 0 a-m, 1 n-z, 2 A-M, 3 N-Z."""
+    return (2 if letter.isupper() else 0) + (letter.lower() > "m")
+
+def _key_on(key, halves):
+    """The parts of an effective key that act on the given halves (0-3)."""
+    return tuple(key[half] for half in halves)
+
+def rivals(scored, letter_counts):
+    """
+    The (shift1, shift2) pairs that cannot be told apart from the best of
+    scored on this sample: every candidate that decrypts it identically,
+    because it only differs in shifts of alphabet halves the sample has no
+    letters from, and every scored candidate within AMBIGUOUS_BITS of it.
+    """
+    score, shift1, shift2 = min(scored)
+    letters = sum(letter_counts.values())
+    halves = sorted({_half(letter) for letter in letter_counts})
+    best_key = effective_key(shift1, shift2)
+    same = {(s1, s2) for s1, s2, key in candidate_keys()
+            if key != best_key and _key_on(key, halves) == _key_on(best_key, halves)}
+    close = {(s1, s2) for other, s1, s2 in scored
+             if (s1, s2) != (shift1, shift2) and (other - score) * letters < AMBIGUOUS_BITS
+             and effective_key(s1, s2) != best_key}
+    return sorted(same | close)
+
+def recover_shifts(path, sample_bytes=SAMPLE_BYTES, workers=None,
+                   confident_score=CONFIDENT_SCORE, top=5):
+    """
+    Scores candidate keys for the encrypted file at path.
+    Returns (ranked, letters, tied): up to `top` (score, shift1, shift2)
+    tuples, best first, the number of letters in the sample and the rivals()
+    of the best candidate. The ranking only covers the candidates scored
+    before the search stopped; it never stops on an ambiguous best.
+    """
+    sample = read_sample(path, sample_bytes)
+    letter_counts, pair_counts = count_letters(sample), count_pairs(sample)
+    letters = sum(letter_counts.values())
+    groups = candidate_groups()
+    workers = workers or os.cpu_count() or 1
+    size = max(1, len(groups) // (workers * 4))
+    jobs = [(letter_counts, pair_counts, groups[i:i + size])
+            for i in range(0, len(groups), size)]
+
+    if letters < MIN_LETTERS:
+        confident_score = float("-inf")
+
+    def settled():
+        return min(scored)[0] <= confident_score and not rivals(scored, letter_counts)
+
+    scored = []
+    if workers == 1:
+        for job in jobs:
+            scored.extend(_score_batch(job))
+            if settled():
+                break
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_score_batch, job) for job in jobs]
+            for future in concurrent.futures.as_completed(futures):
+                scored.extend(future.result())
+                if settled():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+    return sorted(scored)[:top], letters, rivals(scored, letter_counts)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Recover the shifts of a file encrypted with question_1.py.")
+    parser.add_argument("encrypted_file")
+    parser.add_argument("--sample-bytes", type=int, default=SAMPLE_BYTES,
+                        help="bytes read from the start of the file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores, 1 = no pool)")
+    parser.add_argument("--confident-score", type=float, default=CONFIDENT_SCORE,
+                        help="stop once a candidate scores at or below this")
+    parser.add_argument("--top", type=int, default=5, help="candidates to list")
+    parser.add_argument("--decrypt", metavar="OUT",
+                        help="decrypt the whole file with the best key into OUT")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.encrypted_file):
+        print(f"Error: '{args.encrypted_file}' not found.")
+        return 1
+
+    ranked, letters, tied = recover_shifts(args.encrypted_file, args.sample_bytes,
+                                           args.workers, args.confident_score, args.top)
+    if letters < MIN_LETTERS:
+        print(f"Warning: only {letters} letters in the sample; the result is unreliable.")
+
+    print(f"{'shift1':>7}{'shift2':>8}{'score':>10}  effective key")
+    for score, shift1, shift2 in ranked:
+        print(f"{shift1:>7}{shift2:>8}{score:>10.4f}  {effective_key(shift1, shift2)}")
+
+    score, shift1, shift2 = ranked[0]
+    if tied:
+        verdict = "ambiguous"
+    else:
+        verdict = "confident" if score <= args.confident_score else "best guess"
+    print(f"\nRecovered shift1={shift1}, shift2={shift2} ({verdict}; "
+          f"any shifts congruent to these mod 13 are equivalent).")
+    if tied:
+        listed = ", ".join(map(str, tied[:5])) + (f" and {len(tied) - 5} more" if len(tied) > 5 else "")
+        print(f"The sample does not tell it apart from {listed}: they decrypt it "
+              f"identically or almost as plausibly. Check the output by eye.")
+
+    if args.decrypt:
+        if not decrypt_file(args.encrypted_file, args.decrypt, shift1, shift2):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
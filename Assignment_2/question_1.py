@@ -16,10 +16,28 @@ The cipher shifts letters within their 13-letter halves to keep the mapping bije
     - A–M: shift backward by shift1, confined to [A..M]
     - N–Z: shift forward by (shift2 ** 2), confined to [N..Z]
 Non-letters (spaces, punctuation, digits, tabs, newlines) are unchanged.
+
+Run without arguments for the interactive raw_text.txt workflow, or pass a
+directory/glob and shifts for batch mode:
+    python question_1.py texts/ --shift1 3 --shift2 5 --workers 8
+
+Set HIT137_PROFILE=timers (or pass --profile in batch mode) for a JSON
+report of time spent reading, translating and writing; see instrumentation.py.
 """
 
+import argparse
+import contextlib
+import functools
+import glob
+import hashlib
 import os
 import sys
+import time
+
+import instrumentation
+
+# Characters read per chunk when streaming (1 Mi chars, a few MiB of UTF-8)
+CHUNK_SIZE = 1 << 20
 
 # Helpers for character tests
 
@@ -87,71 +105,230 @@ def build_uppercase_map(shift1, shift2):
     dec = {v: k for k, v in enc.items()}
     return enc, dec
 
+# Compiled translation tables
+
+def effective_key(shift1, shift2):
+    """
+    Normalises (shift1, shift2) to the four half-alphabet shifts actually
+    applied, each reduced mod 13: (a–m, n–z, A–M, N–Z).
+    Different shift pairs with the same effective key encrypt identically.
+    """
+    span = 13
+    return (
+        (shift1 * shift2) % span,
+        -(shift1 + shift2) % span,
+        -shift1 % span,
+        (shift2 * shift2) % span,
+    )
+
+# The 52 letters in half order: a–m, n–z, A–M, N–Z
+PLAIN_LETTERS = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+def cipher_letters(key):
+    """What each of PLAIN_LETTERS encrypts to under an effective key."""
+    out = []
+    for base, delta in zip("anAN", key):
+        base_ord = ord(base)
+        for code in range(base_ord, base_ord + 13):
+            out.append(_shift_within_half(base_ord, chr(code), delta))
+    return "".join(out)
+
+class KeySchedule:
+    """
+    Compiled forward and inverse tables for one effective key:
+      enc_table / dec_table     - str.translate tables
+      enc_bytes / dec_bytes     - bytes.translate tables
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self.cipher = cipher_letters(key)
+        self.enc_table = str.maketrans(PLAIN_LETTERS, self.cipher)
+        self.dec_table = str.maketrans(self.cipher, PLAIN_LETTERS)
+        plain = PLAIN_LETTERS.encode("ascii")
+        cipher = self.cipher.encode("ascii")
+        self.enc_bytes = bytes.maketrans(plain, cipher)
+        self.dec_bytes = bytes.maketrans(cipher, plain)
+
+    def __repr__(self):
+        return f"KeySchedule(key={self.key})"
+
+# Number of compiled key schedules kept in the LRU cache
+KEY_CACHE_SIZE = 256
+
+@functools.lru_cache(maxsize=KEY_CACHE_SIZE)
+def _compile_key_schedule(key):
+    return KeySchedule(key)
+
+def get_key_schedule(shift1, shift2):
+    """
+    Returns the cached KeySchedule for (shift1, shift2). Pairs that reduce
+    to the same effective key share one entry.
+    """
+    return _compile_key_schedule(effective_key(shift1, shift2))
+
+def key_cache_info():
+    """Hit/miss counters of the key schedule cache (functools CacheInfo)."""
+    return _compile_key_schedule.cache_info()
+
+def build_translation_tables(shift1, shift2):
+    """
+    Compiles the lowercase and uppercase maps into single str.translate
+    tables covering all 52 letters.
+    Returns (enc_table, dec_table).
+    """
+    schedule = get_key_schedule(shift1, shift2)
+    return schedule.enc_table, schedule.dec_table
+
+def build_byte_tables(shift1, shift2):
+    """
+    Same mapping as build_translation_tables, as 256-byte bytes.translate
+    tables. Letters are ASCII and every byte of a multi-byte UTF-8 sequence
+    is >= 0x80, so translating raw UTF-8 bytes is safe.
+    Returns (enc_table, dec_table).
+    """
+    schedule = get_key_schedule(shift1, shift2)
+    return schedule.enc_bytes, schedule.dec_bytes
+
 # Core operations
 
-def encrypt_file(input_file, output_file, shift1, shift2):
+# Cipher engines:
+#   translate - str.translate over decoded text (default)
+#   bytes     - bytes.translate over raw UTF-8; line endings are copied as-is
+#               instead of going through text-mode newline translation
+#   loop      - original per-character loop, kept as the reference implementation
+ENGINES = ("translate", "bytes", "loop")
+
+def _encrypt_chars(text, lower_map, upper_map):
+    """
+    Reference per-character translation used by both directions.
+    Letters go through the case maps, everything else is kept unchanged.
+    """
+    out_chars = []
+    for ch in text:
+        if 'a' <= ch <= 'z':
+            out_chars.append(lower_map[ch])
+        elif 'A' <= ch <= 'Z':
+            out_chars.append(upper_map[ch])
+        else:
+            out_chars.append(ch)  # keep non-letters unchanged
+    return "".join(out_chars)
+
+def _make_translator(shift1, shift2, engine, decrypt=False):
+    """
+    Returns (translate, binary): a function mapping one chunk to its
+    translated form, and whether it works on bytes rather than str.
+    """
+    if engine == "translate":
+        table = build_translation_tables(shift1, shift2)[decrypt]
+        return (lambda chunk: chunk.translate(table)), False
+    if engine == "bytes":
+        table = build_byte_tables(shift1, shift2)[decrypt]
+        return (lambda chunk: chunk.translate(table)), True
+    if engine == "loop":
+        lower_map = build_lowercase_map(shift1, shift2)[decrypt]
+        upper_map = build_uppercase_map(shift1, shift2)[decrypt]
+        return (lambda chunk: _encrypt_chars(chunk, lower_map, upper_map)), False
+    raise ValueError(f"unknown engine {engine!r}; expected one of {ENGINES}")
+
+def _open_stream(target, mode):
+    """
+    Opens target (UTF-8 for text modes), or passes an already open file-like
+    through untouched (the caller keeps ownership and it is not closed here).
+    """
+    if hasattr(target, "read") or hasattr(target, "write"):
+        return contextlib.nullcontext(target)
+    if "b" in mode:
+        return open(target, mode)
+    return open(target, mode, encoding="utf-8")
+
+def _describe(target):
+    """Name used in status messages for a path or file-like object."""
+    if isinstance(target, (str, os.PathLike)):
+        return target
+    return getattr(target, "name", repr(target))
+
+def _hash_update(digest, chunk):
+    if digest is not None:
+        digest.update(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+
+def _transform_stream(src, dst, translate, binary=False, chunk_size=CHUNK_SIZE,
+                      input_digest=None, output_digest=None):
+    """
+    Translates src into dst. With chunk_size=None the whole input is read
+    at once (original behaviour); otherwise it is processed in chunks of
+    chunk_size characters (bytes for binary engines) so memory stays bounded
+    by the chunk size.
+    input_digest/output_digest are optional hashlib objects updated with
+    the (UTF-8 encoded) input and output chunks as they pass through.
+    """
+    suffix = "b" if binary else ""
+    with _open_stream(src, "r" + suffix) as fin, _open_stream(dst, "w" + suffix) as fout:
+        while True:
+            with instrumentation.timer("cipher.read"):
+                chunk = fin.read() if chunk_size is None else fin.read(chunk_size)
+            if not chunk:
+                break
+            with instrumentation.timer("cipher.translate"):
+                out = translate(chunk)
+            with instrumentation.timer("cipher.hash"):
+                _hash_update(input_digest, chunk)
+                _hash_update(output_digest, out)
+            with instrumentation.timer("cipher.write"):
+                fout.write(out)
+            instrumentation.count("cipher.chunks")
+            instrumentation.count("cipher.units", len(chunk))
+            if chunk_size is None:
+                break
+
+@instrumentation.timed("encrypt")
+def encrypt_file(input_file, output_file, shift1, shift2, chunk_size=CHUNK_SIZE,
+                 engine="translate", digest=None):
     """
     Reads input_file, encrypts characters according to the rules,
     writes encrypted text to output_file.
+    Both arguments may be paths or open file-like objects (binary ones for
+    engine="bytes"). Input is streamed in chunk_size pieces (None reads it
+    all at once). engine selects one of ENGINES.
+    If digest (a hashlib object) is given it is fed the plaintext as it is
+    read, for verify_decryption(mode="digest").
     """
     try:
-        lower_map, _ = build_lowercase_map(shift1, shift2)
-        upper_map, _ = build_uppercase_map(shift1, shift2)
+        translate, binary = _make_translator(shift1, shift2, engine)
 
-        with open(input_file, "r", encoding="utf-8") as f:
-            text = f.read()
+        _transform_stream(input_file, output_file, translate, binary, chunk_size,
+                          input_digest=digest)
 
-        out_chars = []
-        for ch in text:
-            if 'a' <= ch <= 'z':
-                out_chars.append(lower_map[ch])
-            elif 'A' <= ch <= 'Z':
-                out_chars.append(upper_map[ch])
-            else:
-                out_chars.append(ch)  # keep non-letters unchanged
-
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("".join(out_chars))
-
-        print(f"'{output_file}' created/overwritten.")
+        print(f"'{_describe(output_file)}' created/overwritten.")
         return True
 
     except FileNotFoundError:
-        print(f"Error: '{input_file}' not found.")
+        print(f"Error: '{_describe(input_file)}' not found.")
         return False
     except Exception as e:
         print(f"Error during encryption: {e}")
         return False
 
-def decrypt_file(input_file, output_file, shift1, shift2):
+@instrumentation.timed("decrypt")
+def decrypt_file(input_file, output_file, shift1, shift2, chunk_size=CHUNK_SIZE,
+                 engine="translate", digest=None):
     """
     Reads encrypted input_file, decrypts using inverse maps,
     writes plaintext to output_file.
+    Accepts the same targets, chunk_size and engine options as encrypt_file;
+    digest, if given, is fed the decrypted plaintext as it is written.
     """
-    try        :
-        _, lower_dec = build_lowercase_map(shift1, shift2)
-        _, upper_dec = build_uppercase_map(shift1, shift2)
-
-        with open(input_file, "r", encoding="utf-8") as f:
-            text = f.read()
-
-        out_chars = []
-        for ch in text:
-            if 'a' <= ch <= 'z':
-                out_chars.append(lower_dec[ch])
-            elif 'A' <= ch <= 'Z':
-                out_chars.append(upper_dec[ch])
-            else:
-                out_chars.append(ch)
+    try:
+        translate, binary = _make_translator(shift1, shift2, engine, decrypt=True)
 
-        with open(output_file, "w", encoding="utf-8") as f:
-            f.write("".join(out_chars))
+        _transform_stream(input_file, output_file, translate, binary, chunk_size,
+                          output_digest=digest)
 
-        print(f"'{output_file}' created/overwritten.")
+        print(f"'{_describe(output_file)}' created/overwritten.")
         return True
 
     except FileNotFoundError:
-        print(f"Error: '{input_file}' not found.")
+        print(f"Error: '{_describe(input_file)}' not found.")
         return False
     except KeyError as e:
         print(f"Error: decryption map missing key {repr(e)}. Check maps.")
@@ -160,25 +337,120 @@ def decrypt_file(input_file, output_file, shift1, shift2):
         print(f"Error during decryption: {e}")
         return False
 
-def verify_decryption(original_file, decrypted_file):
+# Verification
+
+# Verification modes:
+#   stream - compare the files as decoded text, block by block (default; same
+#            newline handling as reading them in text mode)
+#   bytes  - compare raw bytes block by block
+#   mmap   - compare raw bytes through memory maps (large files)
+#   digest - compare plaintext digests recorded during encrypt/decrypt
+VERIFY_MODES = ("stream", "bytes", "mmap", "digest")
+
+def _first_mismatch(a, b):
+    """Index of the first differing item of two equal-length blocks."""
+    lo, hi = 0, len(a)
+    # Binary search on prefix equality keeps the work in C slice compares
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if a[lo:mid + 1] == b[lo:mid + 1]:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+def _read_blocks(path, binary, use_mmap, block_size):
+    """Yields successive blocks of path as str, bytes or mmap slices."""
+    if use_mmap:
+        import mmap
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for start in range(0, len(mm), block_size):
+                    yield mm[start:start + block_size]
+        return
+    mode = "rb" if binary else "r"
+    with _open_stream(path, mode) as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                return
+            yield block
+
+def find_first_diff(a_path, b_path, context=24, binary=False, use_mmap=False,
+                    block_size=CHUNK_SIZE):
+    """
+    Compares two files block by block and stops at the first differing block.
+    Returns None if they match, otherwise (offset, a_context, b_context) where
+    offset counts characters (bytes when binary or use_mmap) and the context
+    windows come from that block only.
     """
-    Compares original_file with decrypted_file and reports byte-for-byte equality.
+    binary = binary or use_mmap
+    empty = b"" if binary else ""
+    blocks_a = _read_blocks(a_path, binary, use_mmap, block_size)
+    blocks_b = _read_blocks(b_path, binary, use_mmap, block_size)
+    offset = 0
+    carry_a = carry_b = empty
+    while True:
+        # Text blocks can come back shorter than requested, so line the two
+        # sides up before comparing
+        a = carry_a + next(blocks_a, empty)
+        b = carry_b + next(blocks_b, empty)
+        n = min(len(a), len(b))
+        if a[:n] != b[:n]:
+            i = _first_mismatch(a[:n], b[:n])
+            start = max(0, i - context)
+            return offset + i, a[start:i + context], b[start:i + context]
+        if n == 0:
+            if a or b:
+                return offset, a[:context], b[:context]
+            return None
+        carry_a, carry_b = a[n:], b[n:]
+        offset += n
+
+def file_digest(path, algorithm="sha256"):
+    """Hex digest of a file's text content, hashed the same way as encrypt_file."""
+    digest = hashlib.new(algorithm)
+    for block in _read_blocks(path, False, False, CHUNK_SIZE):
+        _hash_update(digest, block)
+    return digest.hexdigest()
+
+@instrumentation.timed("verify")
+def verify_decryption(original_file, decrypted_file, mode="stream",
+                      expected_digest=None, actual_digest=None):
+    """
+    Compares original_file with decrypted_file and reports equality.
+    mode is one of VERIFY_MODES. In "digest" mode expected_digest is the
+    plaintext digest recorded while encrypting and actual_digest the one
+    recorded while decrypting (hashed from decrypted_file if omitted), so
+    the original file is never read again unless the digests differ.
     """
+    diff = None
     try:
-        with open(original_file, "r", encoding="utf-8") as f:
-            a = f.read()
-        with open(decrypted_file, "r", encoding="utf-8") as f:
-            b = f.read()
+        if mode == "digest":
+            if expected_digest is None:
+                raise ValueError("digest mode needs expected_digest")
+            if actual_digest is None:
+                actual_digest = file_digest(decrypted_file)
+            matched = expected_digest == actual_digest
+        elif mode in VERIFY_MODES:
+            diff = find_first_diff(original_file, decrypted_file,
+                                   binary=(mode == "bytes"), use_mmap=(mode == "mmap"))
+            matched = diff is None
+        else:
+            raise ValueError(f"unknown verify mode {mode!r}; expected one of {VERIFY_MODES}")
 
-        if a == b:
+        if matched:
             print("Decryption successful: Files match perfectly!")
             return True
 
         print("Decryption failed: Files do not match.")
-        print(f"Original length: {len(a)}")
-        print(f"Decrypted length: {len(b)}")
-        #Show first difference context
-        show_first_diff(original_file, decrypted_file)
+        print(f"Original size: {os.path.getsize(original_file)} bytes")
+        print(f"Decrypted size: {os.path.getsize(decrypted_file)} bytes")
+        #Show first difference context (already known unless in digest mode)
+        show_first_diff(original_file, decrypted_file,
+                        binary=(mode == "bytes"), use_mmap=(mode == "mmap"), diff=diff)
         return False
 
     except FileNotFoundError as e:
@@ -188,30 +460,23 @@ def verify_decryption(original_file, decrypted_file):
         print(f"Error during verification: {e}")
         return False
 
-def show_first_diff(a_path, b_path, context=24):
+def show_first_diff(a_path, b_path, context=24, binary=False, use_mmap=False, diff=None):
     """
-    Prints the first differing index and a small context window.
-    Helps diagnose any mismatch during testing.
+    Prints the first differing offset and a small context window.
+    Helps diagnose any mismatch during testing. diff is a result already
+    returned by find_first_diff; the files are only compared if it is None.
     """
     try:
-        with open(a_path, "r", encoding="utf-8") as fa, open(b_path, "r", encoding="utf-8") as fb:
-            a = fa.read()
-            b = fb.read()
-        if a == b:
+        if diff is None:
+            diff = find_first_diff(a_path, b_path, context, binary, use_mmap)
+        if diff is None:
             print("No diff.")
             return
-        i = next((i for i, (x, y) in enumerate(zip(a, b)) if x != y), None)
-        if i is None:
-            if len(a) != len(b):
-                print(f"Lengths differ: {len(a)} vs {len(b)}")
-            else:
-                print("No diff found within min length; potential encoding issue.")
-            return
-        start = max(0, i - context)
-        end = min(len(a), i + context)
-        print(f"First difference at index {i}:")
-        print("ORIG:", repr(a[start:end]))
-        print("DECR:", repr(b[start:end]))
+        offset, a, b = diff
+        unit = "byte" if binary or use_mmap else "index"
+        print(f"First difference at {unit} {offset}:")
+        print("ORIG:", repr(a))
+        print("DECR:", repr(b))
     except Exception as e:
         print(f"Error showing diff: {e}")
 
@@ -268,5 +533,145 @@ def main():
     print(f"- {enc}")
     print(f"- {dec}")
 
+# Batch processing
+
+BATCH_REPORT_FIELDS = ["file", "status", "bytes", "encrypt_s", "decrypt_s", "verify_s", "error"]
+
+def _is_within(path, parent):
+    """True if absolute path is parent or lies below it."""
+    return path == parent or path.startswith(parent.rstrip(os.sep) + os.sep)
+
+def collect_batch_inputs(source, exclude=()):
+    """
+    Expands a directory (all files below it) or a glob pattern into a sorted
+    list of (path, relative_name) pairs. Anything in or below a path in
+    exclude (the batch's own output folder and report) is left out, so a
+    rerun never takes an earlier run's output as input.
+    """
+    exclude = [os.path.abspath(path) for path in exclude]
+
+    def wanted(path):
+        path = os.path.abspath(path)
+        return not any(_is_within(path, skip) for skip in exclude)
+
+    if os.path.isdir(source):
+        root = source
+        paths = []
+        for d, dirs, names in os.walk(source):
+            dirs[:] = [name for name in dirs if wanted(os.path.join(d, name))]
+            paths.extend(p for p in (os.path.join(d, name) for name in names) if wanted(p))
+    else:
+        paths = [p for p in glob.glob(source, recursive=True) if os.path.isfile(p) and wanted(p)]
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(p)) for p in paths]) if paths else ""
+    return sorted((p, os.path.relpath(os.path.abspath(p), os.path.abspath(root))) for p in paths)
+
+def _process_batch_file(job):
+    """
+    Worker: encrypt, decrypt and verify one file, timing each stage.
+    Returns one report row; failures are recorded rather than raised.
+    """
+    src, rel, out_dir, shift1, shift2, engine, verify = job
+    enc = os.path.join(out_dir, "encrypted", rel)
+    dec = os.path.join(out_dir, "decrypted", rel)
+    row = {"file": src, "status": "error", "bytes": 0,
+           "encrypt_s": "", "decrypt_s": "", "verify_s": "", "error": ""}
+    try:
+        row["bytes"] = os.path.getsize(src)
+        os.makedirs(os.path.dirname(enc), exist_ok=True)
+        os.makedirs(os.path.dirname(dec), exist_ok=True)
+
+        use_digest = verify == "digest"
+        plain_digest = hashlib.sha256() if use_digest else None
+        dec_digest = hashlib.sha256() if use_digest else None
+
+        start = time.perf_counter()
+        translate, binary = _make_translator(shift1, shift2, engine)
+        _transform_stream(src, enc, translate, binary, input_digest=plain_digest)
+        row["encrypt_s"] = f"{time.perf_counter() - start:.6f}"
+
+        start = time.perf_counter()
+        translate, binary = _make_translator(shift1, shift2, engine, decrypt=True)
+        _transform_stream(enc, dec, translate, binary, output_digest=dec_digest)
+        row["decrypt_s"] = f"{time.perf_counter() - start:.6f}"
+
+        start = time.perf_counter()
+        if use_digest:
+            matched = plain_digest.digest() == dec_digest.digest()
+        else:
+            matched = find_first_diff(src, dec, binary=(verify == "bytes"),
+                                      use_mmap=(verify == "mmap")) is None
+        row["verify_s"] = f"{time.perf_counter() - start:.6f}"
+        row["status"] = "ok" if matched else "mismatch"
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+def run_batch(source, shift1, shift2, out_dir="batch_output", report="batch_report.csv",
+              workers=None, engine="translate", verify="stream"):
+    """
+    Encrypts, decrypts and verifies every file matched by source across a
+    process pool, writing one CSV report row per file (in input order).
+    Returns a dict of status -> count.
+    """
+    # Batch-only imports, kept out of the interactive start-up path
+    import concurrent.futures
+    import csv
+
+    jobs = [(src, rel, out_dir, shift1, shift2, engine, verify)
+            for src, rel in collect_batch_inputs(source, exclude=(out_dir, report))]
+    counts = {"ok": 0, "mismatch": 0, "error": 0}
+    workers = workers or os.cpu_count() or 1
+    # Hand out work in slices so tens of thousands of small files don't
+    # pay one round trip each
+    chunksize = max(1, len(jobs) // (workers * 8))
+
+    with open(report, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=BATCH_REPORT_FIELDS)
+        writer.writeheader()
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+            for row in pool.map(_process_batch_file, jobs, chunksize=chunksize):
+                writer.writerow(row)
+                counts[row["status"]] += 1
+    return counts
+
+def batch_main(argv=None):
+    """
+    Non-interactive entry point:
+        python question_1.py DIR_OR_GLOB --shift1 N --shift2 M [options]
+    Returns the process exit code (non-zero if any file failed).
+    """
+    parser = argparse.ArgumentParser(
+        description="Batch encrypt, decrypt and verify files with the shift cipher.")
+    parser.add_argument("source", help="directory or glob pattern of input files")
+    parser.add_argument("--shift1", type=int, required=True)
+    parser.add_argument("--shift2", type=int, required=True)
+    parser.add_argument("--out-dir", default="batch_output",
+                        help="where encrypted/ and decrypted/ trees are written")
+    parser.add_argument("--report", default="batch_report.csv", help="per-file CSV report")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="worker processes (default: all cores)")
+    parser.add_argument("--engine", choices=ENGINES, default="translate")
+    parser.add_argument("--verify", choices=VERIFY_MODES, default="stream",
+                        help="how decrypted files are checked against the originals")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure_from_args(parser, args)
+
+    start = time.perf_counter()
+    with instrumentation.timer("batch"):
+        counts = run_batch(args.source, args.shift1, args.shift2, args.out_dir,
+                           args.report, args.workers, args.engine, args.verify)
+    elapsed = time.perf_counter() - start
+    total = sum(counts.values())
+    if total == 0:
+        print(f"No input files matched '{args.source}'.")
+        return 1
+    print(f"Processed {total} files in {elapsed:.2f}s: "
+          f"{counts['ok']} ok, {counts['mismatch']} mismatched, {counts['error']} errors.")
+    print(f"Report written to '{args.report}'.")
+    return 0 if counts["ok"] == total else 1
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(batch_main())
     main()
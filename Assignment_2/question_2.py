@@ -1,154 +1,1001 @@
-'''
-Create a program that analyses temperature data collected from multiple weather
-stations in Australia. The data is stored in multiple CSV files under a "temperatures"
-folder, with each file representing data from one year. Process ALL .csv files in the
-temperatures folder. Ignore missing temperature values (NaN) in calculations.
-
-Main Functions to Implement:
-Seasonal Average: Calculate the average temperature for each season across ALL
-stations and ALL years. Save the results to "average_temp.txt".
-    • Use Australian seasons: Summer (Dec-Feb), Autumn (Mar-May), Winter (JunAug), Spring (Sep-Nov)
-    • Output format example: "Summer: 28.5°C"
-Temperature Range: Find the station(s) with the largest temperature range (difference
-between the highest and lowest temperature ever recorded at that station). Save the
-results to "largest_temp_range_station.txt".
-    • Output format example: "Station ABC: Range 45.2°C (Max: 48.3°C, Min: 3.1°C)"
-    • If multiple stations tie, list all of them
-Temperature Stability: Find which station(s) have the most stable temperatures
-(smallest standard deviation) and which have the most variable temperatures (largest
-standard deviation). Save the results to "temperature_stability_stations.txt".
-    • Output format example:
-        o "Most Stable: Station XYZ: StdDev 2.3°C"
-        o "Most Variable: Station DEF: StdDev 12.8°C"
-    • If multiple stations tie, list all of them
-
-'''
-
-import pandas as pd
-import glob
-import os
-
-# Folder containing CSV files
-data_folder = "temperatures"
-csv_files = glob.glob(os.path.join(data_folder, "*.csv"))
-
-if not csv_files:
-    print(f"No CSV files found in folder '{data_folder}'.")
-    exit()
-
-# Dictionary to hold all temperatures per station
-station_data = {}
-# List to hold all temperatures with corresponding month for seasonal calculations
-all_records = []
-
-# Month-to-number mapping
-month_columns = ["January","February","March","April","May","June",
-                 "July","August","September","October","November","December"]
-month_numbers = {month: i+1 for i, month in enumerate(month_columns)}
-
-# 1. Read all CSV files
-for file in csv_files:
-    try:
-        df = pd.read_csv(file)
-        # Ensure required columns exist
-        required_cols = ["STATION_NAME"] + month_columns
-        if not set(required_cols).issubset(df.columns):
-            print(f"Skipping {file}: Missing required columns")
-            continue
-
-        # Process each row
-        for _, row in df.iterrows():
-            station = row["STATION_NAME"]
-            temps = row[month_columns].values.astype(float)
-
-            # Store temps per station
-            if station not in station_data:
-                station_data[station] = []
-            station_data[station].extend(temps)
-
-            # Add to all_records for seasonal avg
-            for month, temp in zip(month_columns, temps):
-                if pd.notna(temp):
-                    all_records.append({"Station": station, "Month": month_numbers[month], "Temperature": temp})
-
-    except Exception as e:
-        print(f"Error reading {file}: {e}")
-
-# Convert all_records to DataFrame
-all_df = pd.DataFrame(all_records)
-
-# 2. Seasonal Average
-
-season_mapping = {
-    "Summer": [12, 1, 2],
-    "Autumn": [3, 4, 5],
-    "Winter": [6, 7, 8],
-    "Spring": [9, 10, 11]
-}
-
-season_avg = {}
-for season, months in season_mapping.items():
-    temps = all_df[all_df["Month"].isin(months)]["Temperature"]
-    season_avg[season] = temps.mean() if not temps.empty else float('nan')
-
-# Save seasonal averages
-with open("average_temp.txt", "w") as f:
-    for season, avg in season_avg.items():
-        if pd.notna(avg):
-            f.write(f"{season}: {avg:.1f}°C\n")
-        else:
-            f.write(f"{season}: No data\n")
-
-# 3. Temperature Range per Station
-
-station_ranges = {}
-max_range = -1
-
-for station, temps in station_data.items():
-    temps = [t for t in temps if pd.notna(t)]
-    if not temps:
-        continue
-    max_temp = max(temps)
-    min_temp = min(temps)
-    temp_range = max_temp - min_temp
-    station_ranges[station] = {"range": temp_range, "max": max_temp, "min": min_temp}
-    if temp_range > max_range:
-        max_range = temp_range
-
-# Find stations with largest range
-largest_range_stations = [s for s, v in station_ranges.items() if v["range"] == max_range]
-
-# Save largest temperature range stations
-with open("largest_temp_range_station.txt", "w") as f:
-    for station in largest_range_stations:
-        v = station_ranges[station]
-        f.write(f"Station {station}: Range {v['range']:.1f}°C (Max: {v['max']:.1f}°C, Min: {v['min']:.1f}°C)\n")
-
-# 4. Temperature Stability (Std Dev)
-
-station_std = {}
-for station, temps in station_data.items():
-    temps = [t for t in temps if pd.notna(t)]
-    if len(temps) > 1:
-        std = pd.Series(temps).std()
-    else:
-        std = 0.0
-    station_std[station] = std
-
-min_std = min(station_std.values())
-max_std = max(station_std.values())
-
-most_stable_stations = [s for s, v in station_std.items() if v == min_std]
-most_variable_stations = [s for s, v in station_std.items() if v == max_std]
-
-# Save stability results
-with open("temperature_stability_stations.txt", "w") as f:
-    for station in most_stable_stations:
-        f.write(f"Most Stable: Station {station}: StdDev {station_std[station]:.1f}°C\n")
-    for station in most_variable_stations:
-        f.write(f"Most Variable: Station {station}: StdDev {station_std[station]:.1f}°C\n")
-
-print("Analysis completed. Results saved to:")
-print("- average_temp.txt")
-print("- largest_temp_range_station.txt")
-print("- temperature_stability_stations.txt")
+'''
+Create a program that analyses temperature data collected from multiple weather
+stations in Australia. The data is stored in multiple CSV files under a "temperatures"
+folder, with each file representing data from one year. Process ALL .csv files in the
+temperatures folder. Ignore missing temperature values (NaN) in calculations.
+
+Main Functions to Implement:
+Seasonal Average: Calculate the average temperature for each season across ALL
+stations and ALL years. Save the results to "average_temp.txt".
+    • Use Australian seasons: Summer (Dec-Feb), Autumn (Mar-May), Winter (JunAug), Spring (Sep-Nov)
+    • Output format example: "Summer: 28.5°C"
+Temperature Range: Find the station(s) with the largest temperature range (difference
+between the highest and lowest temperature ever recorded at that station). Save the
+results to "largest_temp_range_station.txt".
+    • Output format example: "Station ABC: Range 45.2°C (Max: 48.3°C, Min: 3.1°C)"
+    • If multiple stations tie, list all of them
+Temperature Stability: Find which station(s) have the most stable temperatures
+(smallest standard deviation) and which have the most variable temperatures (largest
+standard deviation). Save the results to "temperature_stability_stations.txt".
+    • Output format example:
+        o "Most Stable: Station XYZ: StdDev 2.3°C"
+        o "Most Variable: Station DEF: StdDev 12.8°C"
+    • If multiple stations tie, list all of them
+
+'''
+
+import argparse
+import collections
+import concurrent.futures
+import functools
+import glob
+import hashlib
+import heapq
+import importlib
+import json
+import math
+import os
+import re
+import sys
+
+import instrumentation
+
+class _LazyModule:
+    """
+    Stands in for a module until its first attribute access, then imports it
+    and rebinds the global name to the real module. Keeps numpy and pandas
+    (several hundred ms) out of start-up for runs that never read a CSV.
+    """
+
+    def __init__(self, name, alias):
+        self._name = name
+        self._alias = alias
+
+    def __getattr__(self, attr):
+        module = importlib.import_module(self._name)
+        globals()[self._alias] = module
+        return getattr(module, attr)
+
+np = _LazyModule("numpy", "np")
+pd = _LazyModule("pandas", "pd")
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+# Folder containing CSV files
+DATA_FOLDER = "temperatures"
+
+# Month columns in calendar order (month number = index + 1)
+MONTH_COLUMNS = ["January","February","March","April","May","June",
+                 "July","August","September","October","November","December"]
+REQUIRED_COLUMNS = ["STATION_NAME"] + MONTH_COLUMNS
+
+SEASON_MAPPING = {
+    "Summer": [12, 1, 2],
+    "Autumn": [3, 4, 5],
+    "Winter": [6, 7, 8],
+    "Spring": [9, 10, 11]
+}
+SEASONS = list(SEASON_MAPPING)
+
+# Season code for each month number (index 0 unused)
+MONTH_TO_SEASON = [0] * 13
+for _code, _months in enumerate(SEASON_MAPPING.values()):
+    for _month in _months:
+        MONTH_TO_SEASON[_month] = _code
+
+# 1. Ingestion
+
+# Rough working-set cost per station row beyond the parsed frame itself:
+# twelve melted values times the handful of float64/int arrays built from them
+MELT_BYTES_PER_ROW = 12 * 6 * 8
+# Headroom for the CSV parser's own buffers and temporaries
+CHUNK_SAFETY_FACTOR = 3
+
+def rows_for_budget(csv_file, memory_budget, sample_rows=1000):
+    """
+    Number of CSV rows per chunk that keeps one chunk's working set within
+    memory_budget bytes, estimated from a small sample of the file.
+    """
+    sample = pd.read_csv(csv_file, nrows=sample_rows)
+    per_row = sample.memory_usage(deep=True).sum() / max(len(sample), 1) + MELT_BYTES_PER_ROW
+    return max(1, int(memory_budget / (per_row * CHUNK_SAFETY_FACTOR)))
+
+def _load_columnar_or_none(file):
+    """load_columnar(file), or None (reported) if the copy cannot be read."""
+    try:
+        with instrumentation.timer("load.columnar"):
+            return load_columnar(file)
+    except Exception as e:
+        print(f"Columnar copy of {file} is unreadable ({e}); reading the CSV instead")
+        return None
+
+def _read_chunks(file, use_binary, memory_budget):
+    """Frames of one file: whole, or in budget-sized chunks if memory_budget is set."""
+    df = _load_columnar_or_none(file) if use_binary and columnar_is_fresh(file) else None
+    if memory_budget is None:
+        if df is None:
+            with instrumentation.timer("load.read_csv"):
+                df = pd.read_csv(file)
+        yield df
+        return
+    if df is not None:
+        # The temperature matrix is memory-mapped; slicing only pages in
+        # the rows of the current chunk
+        per_row = MELT_BYTES_PER_ROW + df.shape[1] * 8
+        rows = max(1, int(memory_budget / (per_row * CHUNK_SAFETY_FACTOR)))
+        for start in range(0, len(df), rows):
+            yield df.iloc[start:start + rows]
+        return
+    with pd.read_csv(file, chunksize=rows_for_budget(file, memory_budget)) as reader:
+        while True:
+            with instrumentation.timer("load.read_csv"):
+                df = next(reader, None)
+            if df is None:
+                return
+            yield df
+
+def iter_temperature_frames(csv_files, use_binary=True, memory_budget=None):
+    """
+    Yields validated DataFrames, one per readable CSV, so callers can
+    aggregate file by file without holding the whole archive. Files that
+    cannot be read or lack the required columns are reported and skipped.
+    With use_binary, a fresh columnar copy (see convert_to_columnar) is
+    memory-mapped instead of parsing the CSV text.
+    With memory_budget (bytes), each file is instead yielded in row chunks
+    sized so that one chunk's working set stays within the budget.
+    """
+    for file in csv_files:
+        try:
+            for df in _read_chunks(file, use_binary, memory_budget):
+                # Ensure required columns exist
+                if not set(REQUIRED_COLUMNS).issubset(df.columns):
+                    print(f"Skipping {file}: Missing required columns")
+                    break
+                location = ["LAT", "LON"] if {"LAT", "LON"}.issubset(df.columns) else []
+                instrumentation.count("load.frames")
+                instrumentation.count("load.rows", len(df))
+                yield df[REQUIRED_COLUMNS + location]
+        except Exception as e:
+            print(f"Error reading {file}: {e}")
+
+def peak_memory_mb():
+    """Peak resident set size of this process so far, in MiB (NaN if unknown)."""
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+# Columnar binary copies of the CSVs
+
+# Each CSV gets a sibling .columnar/<stem>/ directory of .npy arrays:
+#   station_codes.npy (int32) + station_names.json  - dictionary-encoded names
+#   stn_id.npy, lat.npy, lon.npy                    - metadata columns; non-numeric
+#                                                     station IDs are dictionary-
+#                                                     encoded instead, as
+#                                                     stn_id_codes.npy + stn_ids.json
+#   temps.npy (float32, rows x 12)                  - month columns
+#   meta.json                                       - written last; its mtime
+#                                                     marks the copy as fresh
+COLUMNAR_DIR = ".columnar"
+COLUMNAR_COLUMNS = ["STATION_NAME", "STN_ID", "LAT", "LON"] + MONTH_COLUMNS
+
+def columnar_path(csv_file):
+    folder, name = os.path.split(csv_file)
+    return os.path.join(folder, COLUMNAR_DIR, os.path.splitext(name)[0])
+
+def columnar_is_fresh(csv_file):
+    """True if a columnar copy exists and is newer than the CSV."""
+    meta = os.path.join(columnar_path(csv_file), "meta.json")
+    try:
+        return os.stat(meta).st_mtime_ns >= os.stat(csv_file).st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def convert_to_columnar(csv_file, temp_dtype="float32"):
+    """
+    Writes the columnar copy of one CSV. Returns False (and leaves no copy)
+    if the CSV lacks any of COLUMNAR_COLUMNS.
+    """
+    df = pd.read_csv(csv_file)
+    if not set(COLUMNAR_COLUMNS).issubset(df.columns):
+        print(f"Skipping {csv_file}: Missing required columns")
+        return False
+    folder = columnar_path(csv_file)
+    os.makedirs(folder, exist_ok=True)
+    _save_dictionary(folder, "station_codes.npy", "station_names.json", df["STATION_NAME"])
+    if df["STN_ID"].dtype.kind in "biuf":
+        np.save(os.path.join(folder, "stn_id.npy"), df["STN_ID"].to_numpy())
+    else:
+        # An object array would be pickled by np.save, and np.load refuses those
+        stn_ids = df["STN_ID"].astype(str).where(df["STN_ID"].notna(), None)
+        _save_dictionary(folder, "stn_id_codes.npy", "stn_ids.json", stn_ids)
+    np.save(os.path.join(folder, "lat.npy"), df["LAT"].to_numpy(dtype=float))
+    np.save(os.path.join(folder, "lon.npy"), df["LON"].to_numpy(dtype=float))
+    np.save(os.path.join(folder, "temps.npy"),
+            np.ascontiguousarray(df[MONTH_COLUMNS].to_numpy(dtype=temp_dtype)))
+    with open(os.path.join(folder, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"rows": len(df), "temp_dtype": np.dtype(temp_dtype).name}, f)
+    return True
+
+def _save_dictionary(folder, codes_file, values_file, column):
+    """Dictionary-encodes a text column: int32 codes plus a JSON list of values."""
+    codes, values = pd.factorize(column, sort=False, use_na_sentinel=False)
+    np.save(os.path.join(folder, codes_file), codes.astype(np.int32))
+    with open(os.path.join(folder, values_file), "w", encoding="utf-8") as f:
+        json.dump([None if pd.isna(value) else value for value in values], f)
+
+def _load_dictionary(folder, codes_file, values_file):
+    with open(os.path.join(folder, values_file), encoding="utf-8") as f:
+        values = json.load(f)
+    codes = np.load(os.path.join(folder, codes_file))
+    if None in values:
+        return np.array(values, dtype=object)[codes]
+    return pd.Categorical.from_codes(codes, categories=values)
+
+def load_columnar(csv_file):
+    """
+    Loads a CSV's columnar copy as a DataFrame. The month columns are
+    memory-mapped, so pages are only read from disk as they are used.
+    """
+    folder = columnar_path(csv_file)
+    temps = np.load(os.path.join(folder, "temps.npy"), mmap_mode="r")
+    df = pd.DataFrame(temps, columns=MONTH_COLUMNS, copy=False)
+    df.insert(0, "STATION_NAME",
+              _load_dictionary(folder, "station_codes.npy", "station_names.json"))
+    if os.path.exists(os.path.join(folder, "stn_ids.json")):
+        df.insert(1, "STN_ID", _load_dictionary(folder, "stn_id_codes.npy", "stn_ids.json"))
+    else:
+        df.insert(1, "STN_ID", np.load(os.path.join(folder, "stn_id.npy")))
+    df.insert(2, "LAT", np.load(os.path.join(folder, "lat.npy")))
+    df.insert(3, "LON", np.load(os.path.join(folder, "lon.npy")))
+    return df
+
+def convert_archive(csv_files):
+    """Refreshes the columnar copy of every CSV that is missing or stale."""
+    converted = 0
+    for file in csv_files:
+        if not columnar_is_fresh(file):
+            try:
+                converted += convert_to_columnar(file)
+            except Exception as e:
+                print(f"Error converting {file}: {e}")
+    return converted
+
+def melt_temperatures(wide_df):
+    """
+    Melts the twelve month columns into long form, one row per recorded
+    temperature, in the same row-then-month order as the source files.
+    Returns (station_codes, station_names, months, temperatures): parallel
+    arrays with NaN temperatures dropped, plus the station names indexed by
+    code in order of first appearance.
+    """
+    station_codes, station_names = pd.factorize(wide_df["STATION_NAME"], sort=False,
+                                                 use_na_sentinel=False)
+    temps = wide_df[MONTH_COLUMNS].to_numpy(dtype=float).ravel()
+    months = np.tile(np.arange(1, 13, dtype=np.int8), len(wide_df))
+    stations = np.repeat(station_codes, len(MONTH_COLUMNS))
+
+    keep = ~np.isnan(temps)
+    return stations[keep], list(station_names), months[keep], temps[keep]
+
+# 2. Streaming aggregation
+
+class RunningStats:
+    """
+    Constant-size summary of one station's temperatures: count, min, max and
+    Welford mean/M2 (sum of squared deviations), merged batch by batch with
+    Chan's parallel update so no individual values are kept.
+    """
+
+    __slots__ = ("count", "min", "max", "mean", "m2")
+
+    def __init__(self):
+        self.count = 0
+        self.min = float("inf")
+        self.max = float("-inf")
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def merge_batch(self, count, mean, m2, lo, hi):
+        """Folds in the summary of a batch of count values."""
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+        self.min = min(self.min, lo)
+        self.max = max(self.max, hi)
+
+    def merge(self, other):
+        self.merge_batch(other.count, other.mean, other.m2, other.min, other.max)
+
+    @property
+    def std(self):
+        """Sample standard deviation (ddof=1); 0.0 with fewer than two values."""
+        if self.count < 2:
+            return 0.0
+        return math.sqrt(self.m2 / (self.count - 1))
+
+class TemperatureAggregator:
+    """
+    Single-pass aggregates over any number of station frames, all keyed by
+    station name in order of first appearance:
+      stations   - RunningStats per station
+      seasons    - per-station [sums, counts] arrays, one slot per season
+      locations  - (LAT, LON) as first seen, if the frames carry them
+    Memory grows with the number of stations, not with the number of files.
+    """
+
+    def __init__(self):
+        self.stations = {}
+        self.seasons = {}
+        self.locations = {}
+
+    def _station(self, name):
+        stats = self.stations.get(name)
+        if stats is None:
+            stats = self.stations[name] = RunningStats()
+            self.seasons[name] = [np.zeros(len(SEASONS)), np.zeros(len(SEASONS), dtype=np.int64)]
+        return stats
+
+    @instrumentation.timed("aggregate.add_frame")
+    def add_frame(self, wide_df):
+        """Folds one wide frame (STATION_NAME + month columns) into the aggregates."""
+        with instrumentation.timer("aggregate.melt"):
+            codes, names, months, temps = melt_temperatures(wide_df)
+
+        n = len(names)
+        slots = codes * len(SEASONS) + np.asarray(MONTH_TO_SEASON, dtype=np.int8)[months]
+        season_sums = np.bincount(slots, weights=temps, minlength=n * len(SEASONS))
+        season_counts = np.bincount(slots, minlength=n * len(SEASONS))
+        season_sums = season_sums.reshape(n, len(SEASONS))
+        season_counts = season_counts.reshape(n, len(SEASONS))
+
+        counts = np.bincount(codes, minlength=n)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.bincount(codes, weights=temps, minlength=n) / counts
+        m2s = np.bincount(codes, weights=(temps - means[codes]) ** 2, minlength=n)
+        lows = np.full(n, np.inf)
+        highs = np.full(n, -np.inf)
+        np.minimum.at(lows, codes, temps)
+        np.maximum.at(highs, codes, temps)
+
+        for i, (name, count, mean, m2, lo, hi) in enumerate(zip(
+                names, counts.tolist(), means.tolist(), m2s.tolist(), lows.tolist(), highs.tolist())):
+            self._station(name).merge_batch(count, mean, m2, lo, hi)
+            sums, season_count = self.seasons[name]
+            sums += season_sums[i]
+            season_count += season_counts[i]
+
+        if "LAT" in wide_df.columns and "LON" in wide_df.columns:
+            first = wide_df.drop_duplicates("STATION_NAME")
+            for name, lat, lon in zip(first["STATION_NAME"], first["LAT"], first["LON"]):
+                self.locations.setdefault(name, (float(lat), float(lon)))
+
+    @instrumentation.timed("aggregate.merge")
+    def merge(self, other):
+        """Folds another aggregator's partial results into this one."""
+        for name, other_stats in other.stations.items():
+            self._station(name).merge(other_stats)
+            sums, counts = self.seasons[name]
+            other_sums, other_counts = other.seasons[name]
+            sums += other_sums
+            counts += other_counts
+        for name, location in other.locations.items():
+            self.locations.setdefault(name, location)
+
+    def subset(self, names):
+        """New aggregator restricted to the given stations (order preserved)."""
+        wanted = set(names)
+        part = TemperatureAggregator()
+        for name, stats in self.stations.items():
+            if name in wanted:
+                part.stations[name] = stats
+                part.seasons[name] = self.seasons[name]
+                if name in self.locations:
+                    part.locations[name] = self.locations[name]
+        return part
+
+    def to_dict(self):
+        """JSON-serialisable form, used by AggregateCache."""
+        return {
+            "stations": [[name, st.count, st.min, st.max, st.mean, st.m2,
+                          self.seasons[name][0].tolist(), self.seasons[name][1].tolist(),
+                          self.locations.get(name)]
+                         for name, st in self.stations.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        aggregator = cls()
+        for name, count, lo, hi, mean, m2, sums, counts, location in data["stations"]:
+            stats = aggregator._station(name)
+            stats.count, stats.min, stats.max, stats.mean, stats.m2 = count, lo, hi, mean, m2
+            aggregator.seasons[name] = [np.array(sums, dtype=float),
+                                        np.array(counts, dtype=np.int64)]
+            if location is not None:
+                aggregator.locations[name] = tuple(location)
+        return aggregator
+
+    def seasonal_averages(self):
+        """Mean temperature per season across all stations and years (NaN if no data)."""
+        totals = np.zeros(len(SEASONS))
+        counts = np.zeros(len(SEASONS), dtype=np.int64)
+        for sums, season_counts in self.seasons.values():
+            totals += sums
+            counts += season_counts
+        return {
+            season: (float(total / count) if count else float("nan"))
+            for season, total, count in zip(SEASONS, totals, counts)
+        }
+
+    @instrumentation.timed("aggregate.ranges")
+    def station_ranges(self):
+        """Max, min and range for every station with at least one temperature."""
+        return {
+            name: {"range": stats.max - stats.min, "max": stats.max, "min": stats.min}
+            for name, stats in self.stations.items() if stats.count
+        }
+
+    @instrumentation.timed("aggregate.std")
+    def station_std(self):
+        """Sample standard deviation (ddof=1) per station; 0.0 below two values."""
+        return {name: stats.std for name, stats in self.stations.items()}
+
+def aggregate_file(csv_file, use_binary=True, memory_budget=None):
+    """Partial aggregates for a single CSV (the unit of work for the pool)."""
+    aggregator = TemperatureAggregator()
+    for df in iter_temperature_frames([csv_file], use_binary, memory_budget):
+        aggregator.add_frame(df)
+    return aggregator
+
+def _run_pool(func, items, workers, use_threads):
+    """Maps func over items in a process (or thread) pool, preserving order."""
+    pool_class = (concurrent.futures.ThreadPoolExecutor if use_threads
+                  else concurrent.futures.ProcessPoolExecutor)
+    chunksize = max(1, len(items) // (workers * 4))
+    with pool_class(max_workers=workers) as pool:
+        return list(pool.map(func, items, chunksize=chunksize))
+
+def aggregate_partials(csv_files, workers=1, use_threads=False, cache=None, use_binary=True,
+                       memory_budget=None):
+    """
+    Per-file TemperatureAggregators, in csv_files order.
+    With workers > 1 files are parsed in a process (or thread) pool. With an
+    AggregateCache only new or changed files are parsed; the cache is then
+    pruned to csv_files and saved. use_binary prefers fresh columnar copies
+    over parsing CSV text. memory_budget (bytes, per worker) switches to
+    chunked reading, see iter_temperature_frames.
+    """
+    partials = {}
+    sources = {}
+    if cache is not None:
+        for file in csv_files:
+            sources[file] = data_source(file, use_binary)
+            cached = cache.lookup(file, sources[file])
+            if cached is not None:
+                partials[file] = cached
+    pending = [file for file in csv_files if file not in partials]
+    work = functools.partial(aggregate_file, use_binary=use_binary, memory_budget=memory_budget)
+    if workers > 1 and len(pending) > 1:
+        fresh = _run_pool(work, pending, workers, use_threads)
+    else:
+        fresh = [work(file) for file in pending]
+    partials.update(zip(pending, fresh))
+
+    if cache is not None:
+        for file, partial in zip(pending, fresh):
+            cache.store(file, partial, sources[file])
+        cache.retain(csv_files)
+        cache.save()
+
+    return [partials[file] for file in csv_files]
+
+def aggregate_files(csv_files, workers=1, use_threads=False, cache=None, use_binary=True,
+                    memory_budget=None):
+    """
+    Aggregates every CSV and returns the merged TemperatureAggregator.
+    Options are as for aggregate_partials. Partials are always merged in
+    csv_files order, so station order, and therefore tie order in the
+    reports, does not depend on which worker finishes first.
+    """
+    aggregator = TemperatureAggregator()
+    if cache is None and (workers <= 1 or len(csv_files) <= 1):
+        for df in iter_temperature_frames(csv_files, use_binary, memory_budget):
+            aggregator.add_frame(df)
+        return aggregator
+
+    for partial in aggregate_partials(csv_files, workers, use_threads, cache, use_binary,
+                                      memory_budget):
+        aggregator.merge(partial)
+    return aggregator
+
+# Persisted per-file aggregates
+
+# Default cache location; it sits next to the CSVs but is not matched by *.csv
+CACHE_FILE = os.path.join(DATA_FOLDER, ".aggregate_cache.json")
+CACHE_VERSION = 3
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def data_source(file, use_binary=True):
+    """
+    Where a run would read file's temperatures from and at what precision:
+    "columnar-float32" (or the copy's dtype) for a fresh columnar copy,
+    otherwise "csv-float64".
+    """
+    if use_binary and columnar_is_fresh(file):
+        try:
+            with open(os.path.join(columnar_path(file), "meta.json"), encoding="utf-8") as f:
+                return f"columnar-{json.load(f)['temp_dtype']}"
+        except (OSError, ValueError, KeyError):
+            pass
+    return "csv-float64"
+
+class AggregateCache:
+    """
+    On-disk cache of per-file partial aggregates, keyed by absolute path and
+    validated by size, mtime and SHA-256 of the content. A file whose size
+    and mtime are unchanged is trusted without hashing; otherwise it is
+    re-hashed and only re-parsed if the content really changed.
+    Each entry also records its data_source(), so aggregates parsed from the
+    float64 CSV and from a float32 columnar copy are never mixed in one run.
+    """
+
+    def __init__(self, path=CACHE_FILE):
+        self.path = path
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == CACHE_VERSION:
+                self.entries = data["files"]
+        except FileNotFoundError:
+            pass
+        except (ValueError, KeyError) as e:
+            print(f"Ignoring unreadable cache {path}: {e}")
+
+    def lookup(self, file, source="csv-float64"):
+        """Cached TemperatureAggregator for file, or None if missing, stale or from another source."""
+        key = os.path.abspath(file)
+        entry = self.entries.get(key)
+        st = os.stat(file)
+        if entry is not None and entry["source"] == source and entry["size"] == st.st_size:
+            fresh = entry["mtime_ns"] == st.st_mtime_ns
+            if not fresh and entry["sha256"] == _file_sha256(file):
+                # Touched but not modified: remember the new mtime
+                entry["mtime_ns"] = st.st_mtime_ns
+                self._dirty = fresh = True
+            if fresh:
+                self.hits += 1
+                return TemperatureAggregator.from_dict(entry["aggregate"])
+        self.misses += 1
+        return None
+
+    def store(self, file, aggregator, source="csv-float64"):
+        st = os.stat(file)
+        self.entries[os.path.abspath(file)] = {
+            "source": source,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+            "sha256": _file_sha256(file),
+            "aggregate": aggregator.to_dict(),
+        }
+        self._dirty = True
+
+    def retain(self, files):
+        """Evicts entries for files that are no longer part of the archive."""
+        keep = {os.path.abspath(file) for file in files}
+        for key in list(self.entries):
+            if key not in keep:
+                del self.entries[key]
+                self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": CACHE_VERSION, "files": self.entries}, f)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+# 3. Queryable dataset
+
+def file_year(path):
+    """Year encoded in a file name such as stations_group_1986.csv, or None."""
+    years = re.findall(r"(?<!\d)(\d{4})(?!\d)", os.path.basename(path))
+    return int(years[-1]) if years else None
+
+# Merged aggregates a TemperatureDataset keeps, least recently used dropped first
+MERGED_CACHE_SIZE = 64
+
+class TemperatureDataset:
+    """
+    Loads the per-file aggregates of a temperatures folder once and answers
+    queries from them without touching the CSVs again.
+
+    Every query accepts the same optional filters:
+      years    - (first, last) inclusive, matched against file_year()
+      stations - iterable of station names
+      bbox     - (min_lat, max_lat, min_lon, max_lon) on each station's LAT/LON
+    Merged aggregates are memoised per filter combination, keeping the
+    MERGED_CACHE_SIZE most recently used ones.
+    """
+
+    def __init__(self, folder=DATA_FOLDER, workers=1, use_threads=False, cache=None,
+                 use_binary=True, memory_budget=None):
+        self.folder = folder
+        # Sorted so the merge order (and tie order) is the same on every platform
+        self.files = sorted(glob.glob(os.path.join(folder, "*.csv")))
+        partials = aggregate_partials(self.files, workers, use_threads, cache, use_binary,
+                                      memory_budget)
+        self.partials = [(file_year(file), partial) for file, partial in zip(self.files, partials)]
+        self._merged = collections.OrderedDict()
+        self._index = None
+
+    def __len__(self):
+        return len(self.files)
+
+    @property
+    def years(self):
+        return sorted({year for year, _ in self.partials if year is not None})
+
+    @property
+    def index(self):
+        """StationYearIndex over this dataset, built on first use."""
+        if self._index is None:
+            self._index = StationYearIndex.from_dataset(self)
+        return self._index
+
+    def aggregate(self, years=None, stations=None, bbox=None):
+        """Merged TemperatureAggregator for the given filters."""
+        # stations may be a one-shot iterator; it is read twice below
+        stations = tuple(stations) if stations is not None else None
+        key = (tuple(years) if years is not None else None,
+               frozenset(stations) if stations is not None else None,
+               tuple(bbox) if bbox is not None else None)
+        merged = self._merged.get(key)
+        if merged is not None:
+            self._merged.move_to_end(key)
+            return merged
+
+        merged = TemperatureAggregator()
+        for year, partial in self.partials:
+            if years is not None and (year is None or not years[0] <= year <= years[1]):
+                continue
+            merged.merge(partial)
+        if stations is not None or bbox is not None:
+            names = merged.stations if stations is None else stations
+            if bbox is not None:
+                min_lat, max_lat, min_lon, max_lon = bbox
+                names = [name for name in names if name in merged.locations
+                         and min_lat <= merged.locations[name][0] <= max_lat
+                         and min_lon <= merged.locations[name][1] <= max_lon]
+            merged = merged.subset(names)
+        self._merged[key] = merged
+        if len(self._merged) > MERGED_CACHE_SIZE:
+            self._merged.popitem(last=False)
+        return merged
+
+    def seasonal_average(self, **filters):
+        """{season: mean temperature} (NaN for seasons without data)."""
+        return self.aggregate(**filters).seasonal_averages()
+
+    def largest_range(self, tolerance=0.0, **filters):
+        """
+        {station: {"range", "max", "min"}} for the station(s) with the largest
+        range; ranges within tolerance of the largest count as ties.
+        """
+        aggregator = self.aggregate(**filters)
+        winners = rank_stations(aggregator, "range", tolerance=tolerance).winners()
+        ranges = aggregator.station_ranges()
+        return {station: ranges[station] for station in winners}
+
+    def stability(self, tolerance=0.0, **filters):
+        """
+        {"most_stable": {station: std}, "most_variable": {station: std}},
+        listing every station tied (within tolerance) for each extreme.
+        """
+        aggregator = self.aggregate(**filters)
+        stable = rank_stations(aggregator, "std", largest=False, tolerance=tolerance)
+        variable = rank_stations(aggregator, "std", largest=True, tolerance=tolerance)
+        return {"most_stable": {s: v for rank, s, v in stable.ranked() if rank == 1},
+                "most_variable": {s: v for rank, s, v in variable.ranked() if rank == 1}}
+
+    def leaderboard(self, metric, k=50, largest=True, tolerance=0.0, **filters):
+        """
+        Top (or bottom, with largest=False) k stations by metric as
+        [(rank, station, value)], extended with any ties at the cut-off.
+        metric is one of RANK_METRICS.
+        """
+        return rank_stations(self.aggregate(**filters), metric, k, largest, tolerance).ranked()
+
+class StationYearIndex:
+    """
+    Precomputed per-(station, year) summaries for O(1)/O(log n) queries over
+    arbitrary year ranges of one station.
+
+    Rows are sorted by (station, year) and each station owns a contiguous
+    row span. Per span there are prefix arrays (with a leading zero) of
+    count, sum and sum of squares, and over all rows a sparse table of
+    per-year minima and maxima, so a range query is two binary searches on
+    the year column plus constant-time lookups.
+    """
+
+    def __init__(self, stations, spans, years, counts, sums, sumsqs, lows, highs):
+        self.stations = stations
+        self.spans = spans
+        self.positions = {name: i for i, name in enumerate(stations)}
+        self.years = years
+        self.prefix_count = self._span_prefix(counts)
+        self.prefix_sum = self._span_prefix(sums)
+        self.prefix_sumsq = self._span_prefix(sumsqs)
+        self.min_table = self._sparse_table(lows, np.minimum)
+        self.max_table = self._sparse_table(highs, np.maximum)
+
+    def _span_prefix(self, values):
+        # Station span [start, end) maps to prefix slots [start + i, end + i]
+        # where i is the station's position, leaving room for the leading zero
+        out = np.zeros(len(values) + len(self.stations))
+        for i, (start, end) in enumerate(self.spans.values()):
+            out[start + i + 1:end + i + 1] = np.cumsum(values[start:end])
+        return out
+
+    @staticmethod
+    def _sparse_table(values, op):
+        table = [values]
+        width = 1
+        while width * 2 <= len(values):
+            prev = table[-1]
+            table.append(op(prev[:-width], prev[width:]))
+            width *= 2
+        return table
+
+    @classmethod
+    def from_dataset(cls, dataset):
+        """Builds the index from a TemperatureDataset's per-file aggregates."""
+        per_station = {}
+        for year, partial in dataset.partials:
+            if year is None:
+                continue
+            for name, st in partial.stations.items():
+                rows = per_station.setdefault(name, {})
+                count, total, sumsq, lo, hi = rows.get(year, (0, 0.0, 0.0, np.inf, -np.inf))
+                rows[year] = (count + st.count,
+                              total + st.mean * st.count,
+                              sumsq + st.m2 + st.count * st.mean * st.mean,
+                              min(lo, st.min), max(hi, st.max))
+
+        stations, spans, flat = [], {}, []
+        for name, rows in per_station.items():
+            spans[name] = (len(flat), len(flat) + len(rows))
+            stations.append(name)
+            flat.extend((year,) + rows[year] for year in sorted(rows))
+        columns = np.array(flat, dtype=float).reshape(len(flat), 6).T
+        return cls(stations, spans, columns[0].astype(np.int64), *columns[1:])
+
+    def query(self, station, first_year=None, last_year=None):
+        """
+        count, mean, std (ddof=1), min, max and range of one station over
+        years [first_year, last_year]; None if it has no data there.
+        """
+        span = self.spans.get(station)
+        if span is None:
+            return None
+        start, end = span
+        years = self.years[start:end]
+        lo = start + (0 if first_year is None else int(np.searchsorted(years, first_year, "left")))
+        hi = start + (len(years) if last_year is None else int(np.searchsorted(years, last_year, "right")))
+        if lo >= hi:
+            return None
+
+        # Prefix slots of a span are shifted by the station's position
+        offset = self.positions[station]
+        count = self.prefix_count[hi + offset] - self.prefix_count[lo + offset]
+        if count == 0:
+            return None
+        total = self.prefix_sum[hi + offset] - self.prefix_sum[lo + offset]
+        sumsq = self.prefix_sumsq[hi + offset] - self.prefix_sumsq[lo + offset]
+        mean = float(total / count)
+        var = max(sumsq - total * mean, 0.0) / (count - 1) if count > 1 else 0.0
+
+        level = (hi - lo).bit_length() - 1
+        width = 1 << level
+        low = min(self.min_table[level][lo], self.min_table[level][hi - width])
+        high = max(self.max_table[level][lo], self.max_table[level][hi - width])
+        return {"count": int(count), "mean": mean, "std": math.sqrt(var),
+                "min": float(low), "max": float(high), "range": float(high - low)}
+
+# 4. Rankings
+
+class Leaderboard:
+    """
+    Top-k (or bottom-k) items from a single pass, using a heap of size k.
+
+    Items whose value is within tolerance of the current k-th value are kept
+    in a small spill list, so ties at the cut-off are never dropped. Equal
+    values keep the order they were pushed in.
+    """
+
+    def __init__(self, k=1, largest=True, tolerance=0.0):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.largest = largest
+        self.tolerance = tolerance
+        self._heap = []
+        self._spill = []
+        self._seq = 0
+
+    def push(self, name, value):
+        if value is None or value != value:  # skip missing and NaN values
+            return
+        key = value if self.largest else -value
+        # The heap root is the worst kept entry: lowest key, latest push
+        entry = (key, -self._seq, name, value)
+        self._seq += 1
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+            return
+        cutoff = self._heap[0][0]
+        if key > cutoff:
+            dropped = heapq.heapreplace(self._heap, entry)
+            self._spill.append(dropped)
+            cutoff = self._heap[0][0]
+            self._spill = [e for e in self._spill if cutoff - e[0] <= self.tolerance]
+        elif cutoff - key <= self.tolerance:
+            self._spill.append(entry)
+
+    def extend(self, items):
+        for name, value in items:
+            self.push(name, value)
+        return self
+
+    def ranked(self):
+        """
+        [(rank, name, value)] best first. Entries within tolerance of the
+        first entry of their group share its rank (1, 1, 3, ...).
+        """
+        entries = sorted(self._heap + self._spill, key=lambda e: (-e[0], -e[1]))
+        result = []
+        leader_key = None
+        rank = 0
+        for position, (key, _, name, value) in enumerate(entries, start=1):
+            if leader_key is None or leader_key - key > self.tolerance:
+                leader_key, rank = key, position
+            result.append((rank, name, value))
+        return result
+
+    def winners(self):
+        """Names sharing rank 1."""
+        return [name for rank, name, _ in self.ranked() if rank == 1]
+
+# Per-station values that can be ranked; season names rank seasonal means
+RANK_METRICS = ("range", "std", "mean") + tuple(SEASONS)
+
+def _station_metric(aggregator, name, metric):
+    stats = aggregator.stations[name]
+    if metric == "std":
+        return stats.std
+    if stats.count == 0:
+        return None
+    if metric == "range":
+        return stats.max - stats.min
+    if metric == "mean":
+        return stats.mean
+    sums, counts = aggregator.seasons[name]
+    slot = SEASONS.index(metric)
+    return float(sums[slot] / counts[slot]) if counts[slot] else None
+
+def rank_stations(aggregator, metric, k=1, largest=True, tolerance=0.0):
+    """Leaderboard of aggregator's stations by one of RANK_METRICS."""
+    if metric not in RANK_METRICS:
+        raise ValueError(f"unknown metric {metric!r}; expected one of {RANK_METRICS}")
+    # Per metric, so the std/range ranking main() runs shows up in the profile report
+    with instrumentation.timer(f"aggregate.rank.{metric}"):
+        return Leaderboard(k, largest, tolerance).extend(
+            (name, _station_metric(aggregator, name, metric)) for name in aggregator.stations)
+
+# 5. Reports
+
+@instrumentation.timed("write")
+def write_seasonal_averages(season_avg, path="average_temp.txt"):
+    with open(path, "w") as f:
+        for season, avg in season_avg.items():
+            if pd.notna(avg):
+                f.write(f"{season}: {avg:.1f}°C\n")
+            else:
+                f.write(f"{season}: No data\n")
+
+@instrumentation.timed("write")
+def write_largest_range(largest, path="largest_temp_range_station.txt"):
+    with open(path, "w") as f:
+        for station, v in largest.items():
+            f.write(f"Station {station}: Range {v['range']:.1f}°C (Max: {v['max']:.1f}°C, Min: {v['min']:.1f}°C)\n")
+
+@instrumentation.timed("write")
+def write_stability(stability, path="temperature_stability_stations.txt"):
+    with open(path, "w") as f:
+        for station, std in stability["most_stable"].items():
+            f.write(f"Most Stable: Station {station}: StdDev {std:.1f}°C\n")
+        for station, std in stability["most_variable"].items():
+            f.write(f"Most Variable: Station {station}: StdDev {std:.1f}°C\n")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Analyse station temperatures in temperatures/.")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="parse year files in parallel with this many workers")
+    parser.add_argument("--threads", action="store_true",
+                        help="use a thread pool instead of a process pool")
+    parser.add_argument("--cache-file", default=CACHE_FILE,
+                        help="where per-file aggregates are cached between runs")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="re-read every CSV and leave the cache untouched")
+    parser.add_argument("--convert", action="store_true",
+                        help="write/refresh float32 columnar copies of the CSVs first")
+    parser.add_argument("--no-binary", action="store_true",
+                        help="always parse the CSV text, even if columnar copies exist")
+    parser.add_argument("--tolerance", type=float, default=0.0,
+                        help="values within this many °C of the best count as ties")
+    parser.add_argument("--top", type=int, default=0,
+                        help="also print the top-K range and std leaderboards")
+    parser.add_argument("--memory-budget", type=float, default=None, metavar="MB",
+                        help="read CSVs in chunks that fit this budget (per worker) "
+                             "and report peak memory")
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure_from_args(parser, args)
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    csv_files = glob.glob(os.path.join(DATA_FOLDER, "*.csv"))
+    if not csv_files:
+        print(f"No CSV files found in folder '{DATA_FOLDER}'.")
+        return
+
+    if args.convert:
+        print(f"Converted {convert_archive(csv_files)} CSV files to columnar format.")
+
+    cache = None if args.no_cache else AggregateCache(args.cache_file)
+    memory_budget = None if args.memory_budget is None else int(args.memory_budget * (1 << 20))
+    dataset = TemperatureDataset(DATA_FOLDER, args.workers, args.threads, cache,
+                                 use_binary=not args.no_binary, memory_budget=memory_budget)
+
+    write_seasonal_averages(dataset.seasonal_average())
+    write_largest_range(dataset.largest_range(args.tolerance))
+    write_stability(dataset.stability(args.tolerance))
+
+    if args.top:
+        for title, metric, largest in (("Largest range", "range", True),
+                                       ("Most variable", "std", True),
+                                       ("Most stable", "std", False)):
+            print(f"{title} (top {args.top}):")
+            for rank, station, value in dataset.leaderboard(metric, args.top, largest,
+                                                            args.tolerance):
+                print(f"  {rank:>3}. {station}: {value:.2f}°C")
+
+    print("Analysis completed. Results saved to:")
+    print("- average_temp.txt")
+    print("- largest_temp_range_station.txt")
+    print("- temperature_stability_stations.txt")
+    if memory_budget is not None:
+        print(f"Peak memory: {peak_memory_mb():.1f} MiB")
+
+if __name__ == "__main__":
+    main()
@@ -1,97 +1,301 @@
-'''
-Create a program that uses a recursive function to generate a geometric pattern using
-Python's turtle graphics. The pattern starts with a regular polygon and recursively
-modifies each edge to create intricate designs.
-Pattern Generation Rules:
-For each edge of the shape:
-1. Divide the edge into three equal segments
-2. Replace the middle segment with two sides of an equilateral triangle pointing
-inward (creating an indentation)
-3. This transforms one straight edge into four smaller edges, each 1/3 the length of
-the original edge
-4. Apply this same process recursively to each of the four new edges based on the
-specified depth
-Visual Example:
-Depth 0: Draw a straight line: ———— (no modification)
-Depth 1: Line becomes: ——\⁄—— (indentation pointing inward)
-
-Depth 2: Each of the 4 segments from depth 1 gets its own indentation
-User Input Parameters:
-The program should prompt the user for:
-Number of sides: Determines the starting shape
-Side length: The length of each edge of the initial polygon in pixels
-Recursion depth: How many times to apply the pattern rules
-Example Execution:
-Enter the number of sides: 4
-Enter the side length: 300
-Enter the recursion depth: 3
-'''
-import matplotlib.pyplot as plt
-import math
-
-import turtle
-import math
-
-def draw_koch_segment(t, x0, y0, x1, y1, depth):
-    """Recursively draw a Koch segment using Turtle"""
-    if depth == 0:
-        t.goto(x1, y1)
-        return
-
-    dx = (x1 - x0) / 3
-    dy = (y1 - y0) / 3
-
-    xA, yA = x0, y0
-    xB, yB = x0 + dx, y0 + dy
-    xD, yD = x0 + 2*dx, y0 + 2*dy
-    xE, yE = x1, y1
-
-    # Peak of the triangle
-    angle = math.atan2(dy, dx) - math.pi / 3
-    length = math.hypot(dx, dy)
-    xC = xB + math.cos(angle) * length
-    yC = yB + math.sin(angle) * length
-
-    draw_koch_segment(t, xA, yA, xB, yB, depth - 1)
-    draw_koch_segment(t, xB, yB, xC, yC, depth - 1)
-    draw_koch_segment(t, xC, yC, xD, yD, depth - 1)
-    draw_koch_segment(t, xD, yD, xE, yE, depth - 1)
-
-def draw_koch_polygon(sides, length, depth):
-    """Draw a Koch polygon in Turtle window"""
-    angle = 2 * math.pi / sides
-    radius = length / (2 * math.sin(math.pi / sides))
-
-    # Compute vertices
-    vertices = []
-    for i in range(sides):
-        x = radius * math.sin(i * angle)
-        y = -radius * math.cos(i * angle)
-        vertices.append((x, y))
-
-    # Setup Turtle
-    t = turtle.Turtle()
-    t.speed(0)
-    t.penup()
-    t.goto(vertices[0])
-    t.pendown()
-
-    # Draw each edge
-    for i in range(sides):
-        x0, y0 = vertices[i]
-        x1, y1 = vertices[(i + 1) % sides]
-        draw_koch_segment(t, x0, y0, x1, y1, depth)
-
-    t.hideturtle()
-    turtle.done()
-
-def main():
-    print("Geometric Pattern Generator (Turtle Version)")
-    sides = int(input("Enter the number of sides: "))
-    length = float(input("Enter the side length: "))
-    depth = int(input("Enter the recursion depth: "))
-
-    draw_koch_polygon(sides, length, depth)
-
-if __name__ == "__main__":
-    main()
+'''
+Create a program that uses a recursive function to generate a geometric pattern using
+Python's turtle graphics. The pattern starts with a regular polygon and recursively
+modifies each edge to create intricate designs.
+Pattern Generation Rules:
+For each edge of the shape:
+1. Divide the edge into three equal segments
+2. Replace the middle segment with two sides of an equilateral triangle pointing
+inward (creating an indentation)
+3. This transforms one straight edge into four smaller edges, each 1/3 the length of
+the original edge
+4. Apply this same process recursively to each of the four new edges based on the
+specified depth
+Visual Example:
+Depth 0: Draw a straight line: ———— (no modification)
+Depth 1: Line becomes: ——\⁄—— (indentation pointing inward)
+
+Depth 2: Each of the 4 segments from depth 1 gets its own indentation
+User Input Parameters:
+The program should prompt the user for:
+Number of sides: Determines the starting shape
+Side length: The length of each edge of the initial polygon in pixels
+Recursion depth: How many times to apply the pattern rules
+Example Execution:
+Enter the number of sides: 4
+Enter the side length: 300
+Enter the recursion depth: 3
+'''
+import argparse
+import itertools
+import math
+import os
+
+import instrumentation
+
+# turtle (Tk), numpy and matplotlib are imported inside the functions that
+# use them, so prompting, SVG output and --help start without loading them
+
+def draw_koch_segment(t, x0, y0, x1, y1, depth):
+    """Recursively draw a Koch segment using Turtle"""
+    if depth == 0:
+        t.goto(x1, y1)
+        return
+
+    dx = (x1 - x0) / 3
+    dy = (y1 - y0) / 3
+
+    xA, yA = x0, y0
+    xB, yB = x0 + dx, y0 + dy
+    xD, yD = x0 + 2*dx, y0 + 2*dy
+    xE, yE = x1, y1
+
+    # Peak of the triangle
+    angle = math.atan2(dy, dx) - math.pi / 3
+    length = math.hypot(dx, dy)
+    xC = xB + math.cos(angle) * length
+    yC = yB + math.sin(angle) * length
+
+    draw_koch_segment(t, xA, yA, xB, yB, depth - 1)
+    draw_koch_segment(t, xB, yB, xC, yC, depth - 1)
+    draw_koch_segment(t, xC, yC, xD, yD, depth - 1)
+    draw_koch_segment(t, xD, yD, xE, yE, depth - 1)
+
+def polygon_vertices(sides, length):
+    """Vertices of the regular polygon the pattern starts from"""
+    angle = 2 * math.pi / sides
+    radius = length / (2 * math.sin(math.pi / sides))
+
+    vertices = []
+    for i in range(sides):
+        x = radius * math.sin(i * angle)
+        y = -radius * math.cos(i * angle)
+        vertices.append((x, y))
+    return vertices
+
+# Turn (in 60 degree steps, positive = towards the peak) taken by each of the
+# four sub-segments, and the change in heading when a base-4 digit of the
+# segment index goes from d - 1 to d
+KOCH_TURNS = (0, 1, -1, 0)
+KOCH_TURN_STEPS = (None, 1, -2, 1)
+
+def koch_points(sides, length, depth):
+    """
+    Lazily yield the vertices of the Koch polygon, starting and ending at
+    the first polygon vertex.
+
+    Iterative L-system walk instead of recursion: segment i of an edge has
+    heading sum(KOCH_TURNS[digit]) over the base-4 digits of i, updated in
+    O(1) from the lowest non-zero digit when i is incremented. The six
+    possible step vectors are computed once per edge, so there is no
+    per-segment trig and no call stack.
+    """
+    vertices = polygon_vertices(sides, length)
+    x, y = vertices[0]
+    yield x, y
+    segments = 4 ** depth
+    for i in range(sides):
+        x0, y0 = vertices[i]
+        x1, y1 = vertices[(i + 1) % sides]
+        heading = math.atan2(y1 - y0, x1 - x0)
+        step = math.hypot(x1 - x0, y1 - y0) / 3 ** depth
+        # Each turn rotates the heading by -60 degrees (the peak points inward)
+        steps = [(step * math.cos(heading - k * math.pi / 3),
+                  step * math.sin(heading - k * math.pi / 3)) for k in range(6)]
+
+        x, y = x0, y0
+        turn = 0
+        for n in range(1, segments):
+            dx, dy = steps[turn]
+            x += dx
+            y += dy
+            yield x, y
+            # Lowest non-zero base-4 digit of n decides the heading change
+            shift = ((n & -n).bit_length() - 1) & ~1
+            turn = (turn + KOCH_TURN_STEPS[(n >> shift) & 3]) % 6
+        # Snap to the exact corner so rounding never accumulates across edges
+        yield x1, y1
+
+# Rotation taking a segment's direction to its peak edge (60 degrees towards
+# the inside), applied to row vectors as v @ KOCH_PEAK_ROTATION
+_COS60 = 0.5
+_SIN60 = math.sqrt(3) / 2
+KOCH_PEAK_ROTATION = ((_COS60, -_SIN60),
+                      (_SIN60, _COS60))
+
+@instrumentation.timed("koch.vertices")
+def koch_vertices(sides, length, depth, dtype="float64"):
+    """
+    All vertices of the Koch polygon as a contiguous (sides * 4**depth + 1, 2)
+    array, closed (the last row repeats the first), in the same order as
+    koch_points.
+
+    Each level is expanded at once: the N segments between consecutive rows
+    become 4N segments through broadcast arithmetic, with no Python work per
+    segment. dtype=np.float32 halves memory for very deep patterns.
+    """
+    import numpy as np
+
+    vertices = polygon_vertices(sides, length)
+    points = np.array(vertices + vertices[:1], dtype=dtype)
+    rotation = np.array(KOCH_PEAK_ROTATION, dtype=dtype)
+    for _ in range(depth):
+        start = points[:-1]
+        third = (points[1:] - start) / 3
+        level = np.empty((len(start), 4, 2), dtype=dtype)
+        level[:, 0] = start
+        level[:, 1] = start + third
+        level[:, 2] = level[:, 1] + third @ rotation
+        level[:, 3] = start + 2 * third
+
+        expanded = np.empty((4 * len(start) + 1, 2), dtype=dtype)
+        expanded[:-1] = level.reshape(-1, 2)
+        expanded[-1] = points[-1]
+        points = expanded
+    return points
+
+# Turtle preview
+
+def draw_koch_polygon(sides, length, depth, update_every=4096):
+    """
+    Draw a Koch polygon in Turtle window.
+    Screen updates are batched with tracer(0): the window is refreshed once
+    every update_every points instead of after every segment.
+    """
+    import turtle
+
+    points = koch_points(sides, length, depth)
+    if instrumentation.enabled():
+        # Generate everything up front so generation and drawing are timed apart
+        with instrumentation.timer("koch.points"):
+            points = iter(list(points))
+
+    # Setup Turtle
+    screen = turtle.Screen()
+    screen.tracer(0)
+    t = turtle.Turtle()
+    t.hideturtle()
+    t.penup()
+    t.goto(next(points))
+    t.pendown()
+
+    # Draw each edge
+    with instrumentation.timer("turtle.draw"):
+        for i, point in enumerate(points, start=1):
+            t.goto(point)
+            if i % update_every == 0:
+                screen.update()
+        screen.update()
+    instrumentation.count("turtle.points", i + 1)
+    turtle.done()
+
+# Headless rendering
+
+def render_png(path, sides, length, depth, size_px=800, linewidth=0.5):
+    """Render the pattern to a PNG of size_px x size_px using matplotlib's Agg canvas"""
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    points = koch_vertices(sides, length, depth)
+    dpi = 100
+    fig = Figure(figsize=(size_px / dpi, size_px / dpi), dpi=dpi)
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes((0, 0, 1, 1))
+    # One polyline for the whole polygon keeps it to a single draw call
+    ax.plot(points[:, 0], points[:, 1], color="black", linewidth=linewidth)
+    ax.set_aspect("equal")
+    ax.margins(0.02)
+    ax.axis("off")
+    with instrumentation.timer("render.png"):
+        fig.savefig(path, dpi=dpi)
+
+def write_svg(target, sides, length, depth, points_per_line=1024):
+    """
+    Stream the pattern as an SVG path to target (a path or a text stream).
+    Vertices come lazily from koch_points and are written in blocks, so even
+    very deep patterns never need all points in memory.
+    """
+    # A Koch curve never strays more than sqrt(3)/6 of its edge length from
+    # the edge, so the polygon's bounds plus that margin contain the pattern
+    corners = polygon_vertices(sides, length)
+    xs = [x for x, _ in corners]
+    ys = [y for _, y in corners]
+    pad = (math.sqrt(3) / 6 + 0.02) * length
+    left, top = min(xs) - pad, -max(ys) - pad
+    width, height = max(xs) - min(xs) + 2 * pad, max(ys) - min(ys) + 2 * pad
+
+    def write(f):
+        f.write('<svg xmlns="http://www.w3.org/2000/svg" '
+                f'viewBox="{left:.3f} {top:.3f} {width:.3f} {height:.3f}">\n')
+        # Turtle coordinates have y pointing up, SVG has it pointing down
+        f.write('<path transform="scale(1,-1)" fill="none" stroke="black" '
+                'stroke-width="0.5" vector-effect="non-scaling-stroke" d="')
+        points = koch_points(sides, length, depth)
+        x, y = next(points)
+        f.write(f"M{x:.3f} {y:.3f}")
+        block = []
+        for x, y in points:
+            block.append(f"L{x:.3f} {y:.3f}")
+            if len(block) == points_per_line:
+                f.write("\n" + "".join(block))
+                block.clear()
+        f.write("\n" + "".join(block) + 'Z"/>\n</svg>\n')
+
+    with instrumentation.timer("render.svg"):
+        if hasattr(target, "write"):
+            write(target)
+        else:
+            with open(target, "w", encoding="utf-8") as f:
+                write(f)
+
+RENDER_FORMATS = ("png", "svg")
+
+def render_batch(combinations, out_dir, fmt="png"):
+    """
+    Render every (sides, length, depth) combination to out_dir without a
+    display. Returns the written file paths.
+    """
+    if fmt not in RENDER_FORMATS:
+        raise ValueError(f"unknown format {fmt!r}; expected one of {RENDER_FORMATS}")
+    os.makedirs(out_dir, exist_ok=True)
+    paths = []
+    for sides, length, depth in combinations:
+        path = os.path.join(out_dir, f"koch_{sides}_{length:g}_{depth}.{fmt}")
+        if fmt == "png":
+            render_png(path, sides, length, depth)
+        else:
+            write_svg(path, sides, length, depth)
+        paths.append(path)
+    return paths
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Koch polygon generator. Without --render, prompts and previews in turtle.")
+    parser.add_argument("--render", metavar="OUT_DIR",
+                        help="render every combination below to OUT_DIR instead of prompting")
+    parser.add_argument("--format", choices=RENDER_FORMATS, default="png")
+    parser.add_argument("--sides", type=int, nargs="+", default=[4])
+    parser.add_argument("--length", type=float, nargs="+", default=[300])
+    parser.add_argument("--depth", type=int, nargs="+", default=[3])
+    instrumentation.add_arguments(parser)
+    args = parser.parse_args(argv)
+    instrumentation.configure_from_args(parser, args)
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.render:
+        combinations = itertools.product(args.sides, args.length, args.depth)
+        for path in render_batch(combinations, args.render, args.format):
+            print(f"Wrote {path}")
+        return
+
+    print("Geometric Pattern Generator (Turtle Version)")
+    sides = int(input("Enter the number of sides: "))
+    length = float(input("Enter the side length: "))
+    depth = int(input("Enter the recursion depth: "))
+
+    draw_koch_polygon(sides, length, depth)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+"""
+Regression benchmarks for every program in the repository.
+
+Generates seeded synthetic inputs, runs the current implementation of each
+program on them and appends one JSON record per run (commit, settings, and
+per-workload best time and peak memory growth) to a results file, so runs
+from different commits can be compared:
+
+  cipher_ascii    Assignment_2 question_1.encrypt_file on an ASCII corpus
+  cipher_unicode  the same on mixed ASCII/Unicode text
+  temperatures    Assignment_2 question_2 seasonal/range/stability analysis on
+                  a stations x years archive with a given NaN density
+  koch            Assignment_2 question_3.draw_koch_segment, headless
+  square          Assignment_1 drawSquare written to the null device
+  triangle        Assignment_1 verifyTriangle over random side triples
+  triangle_bulk   Assignment_1 verifyTriangles over the same triples
+
+Each workload runs in a fresh process; peak memory is the growth of that
+process's peak RSS while the workload ran (inputs are generated before the
+measurement starts). The same seed always produces the same inputs.
+
+Usage:
+    python benchmarks.py [--only cipher_ascii koch ...] [--repeat 3]
+                         [--output benchmark_results.jsonl] [--compare OLD.jsonl]
+                         [--cipher-mb 16] [--stations 500 --years 20 --nan 0.05]
+                         [--koch-sides 4 --koch-depth 7] [--square-size 2000]
+                         [--triangles 200000] [--seed 137]
+"""
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+for _folder in ("Assignment_1", "Assignment_2"):
+    if os.path.join(ROOT, _folder) not in sys.path:
+        sys.path.insert(0, os.path.join(ROOT, _folder))
+
+from bench_common import RecordingTurtle, peak_memory_mb  # noqa: E402
+
+# Synthetic input generators
+
+ASCII_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ     .,;!?\n"
+UNICODE_ALPHABET = ASCII_ALPHABET + "éèüßñçøΩλπжд漢字かな🙂—“”"
+
+def make_text_corpus(path, size_mb, alphabet, seed):
+    """Writes about size_mb MiB of UTF-8 text drawn from alphabet."""
+    rng = random.Random(seed)
+    block = "".join(rng.choice(alphabet) for _ in range(1 << 16))
+    target = size_mb * (1 << 20)
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        while f.tell() < target:
+            f.write(block)
+
+def make_temperature_archive(folder, stations, years, nan_fraction, seed):
+    """
+    Writes one stations_group_<year>.csv per year in the layout of
+    Assignment_2/temperatures: STATION_NAME, STN_ID, LAT, LON and twelve
+    monthly means following a seasonal curve per station, with about
+    nan_fraction of the monthly values left blank.
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    months = ["January", "February", "March", "April", "May", "June", "July",
+              "August", "September", "October", "November", "December"]
+    names = [f"STATION-{i:05d}" for i in range(stations)]
+    lat = rng.uniform(-43, -11, stations).round(2)
+    lon = rng.uniform(113, 153, stations).round(2)
+    base = rng.uniform(15, 30, stations)
+    swing = rng.uniform(2, 10, stations)
+    season = np.cos(2 * np.pi * np.arange(12) / 12)
+    paths = []
+    for year in range(1986, 1986 + years):
+        temps = base[:, None] + swing[:, None] * season + rng.normal(0, 1, (stations, 12))
+        temps = temps.round(2)
+        temps[rng.random(temps.shape) < nan_fraction] = np.nan
+        path = os.path.join(folder, f"stations_group_{year}.csv")
+        with open(path, "w", newline="") as f:
+            f.write("STATION_NAME,STN_ID,LAT,LON," + ",".join(months) + "\n")
+            for i in range(stations):
+                values = ",".join("" if np.isnan(t) else f"{t:g}" for t in temps[i])
+                f.write(f"{names[i]},{10000 + i},{lat[i]},{lon[i]},{values}\n")
+        paths.append(path)
+    return paths
+
+def make_triangle_sides(count, seed):
+    """count random (a, b, c) triples, some non-positive, some degenerate."""
+    rng = random.Random(seed)
+    return [tuple(rng.choice((rng.uniform(-1, 10), float(rng.randint(0, 10))))
+                  for _ in range(3)) for _ in range(count)]
+
+# Workloads: each one takes (settings, work_dir) and returns a callable that
+# does the timed work, so input preparation stays outside the measurement
+
+def _prepare_cipher(settings, work_dir, unicode):
+    import question_1
+
+    name = "unicode.txt" if unicode else "ascii.txt"
+    src = os.path.join(work_dir, name)
+    dst = os.path.join(work_dir, name + ".enc")
+    if not os.path.exists(src):
+        make_text_corpus(src, settings["cipher_mb"],
+                         UNICODE_ALPHABET if unicode else ASCII_ALPHABET, settings["seed"])
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            if not question_1.encrypt_file(src, dst, 3, 5):
+                raise RuntimeError("encrypt_file failed")
+    return run
+
+def _prepare_temperatures(settings, work_dir):
+    import question_2
+    # question_2 imports these on first use; keep that out of the timing
+    import numpy  # noqa: F401
+    import pandas  # noqa: F401
+
+    folder = os.path.join(work_dir, "temperatures")
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+        make_temperature_archive(folder, settings["stations"], settings["years"],
+                                 settings["nan"], settings["seed"])
+    out = os.path.join(work_dir, "q2_")
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            dataset = question_2.TemperatureDataset(folder, use_binary=False)
+            question_2.write_seasonal_averages(dataset.seasonal_average(), out + "average_temp.txt")
+            question_2.write_largest_range(dataset.largest_range(), out + "range.txt")
+            question_2.write_stability(dataset.stability(), out + "stability.txt")
+    return run
+
+def _prepare_koch(settings, work_dir):
+    import question_3
+
+    sides, depth = settings["koch_sides"], settings["koch_depth"]
+
+    def run():
+        t = RecordingTurtle(keep_points=False)
+        vertices = question_3.polygon_vertices(sides, 300)
+        t.goto(vertices[0])
+        for i in range(sides):
+            x0, y0 = vertices[i]
+            x1, y1 = vertices[(i + 1) % sides]
+            question_3.draw_koch_segment(t, x0, y0, x1, y1, depth)
+    return run
+
+def _prepare_square(settings, work_dir):
+    from assignment1_task2 import drawSquare
+
+    def run():
+        with open(os.devnull, "w") as devnull:
+            drawSquare(settings["square_size"], devnull)
+    return run
+
+def _prepare_triangle(settings, work_dir):
+    from assignment1_task1 import verifyTriangle
+
+    sides = make_triangle_sides(settings["triangles"], settings["seed"])
+
+    def run():
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            for a, b, c in sides:
+                verifyTriangle(a, b, c)
+    return run
+
+def _prepare_triangle_bulk(settings, work_dir):
+    import numpy as np
+    from assignment1_task1 import verifyTriangles
+
+    sides = np.array(make_triangle_sides(settings["triangles"], settings["seed"]))
+
+    def run():
+        verifyTriangles(sides)
+    return run
+
+WORKLOADS = {
+    "cipher_ascii": lambda settings, work_dir: _prepare_cipher(settings, work_dir, False),
+    "cipher_unicode": lambda settings, work_dir: _prepare_cipher(settings, work_dir, True),
+    "temperatures": _prepare_temperatures,
+    "koch": _prepare_koch,
+    "square": _prepare_square,
+    "triangle": _prepare_triangle,
+    "triangle_bulk": _prepare_triangle_bulk,
+}
+
+# Running
+
+def _run_workload(job):
+    """Child process: prepares one workload, then times a single run of it."""
+    name, settings, work_dir = job
+    run = WORKLOADS[name](settings, work_dir)
+    baseline = peak_memory_mb()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    return elapsed, peak_memory_mb() - baseline
+
+def run_suite(names, settings, repeat=1):
+    """
+    Runs each named workload `repeat` times, each time in a fresh process.
+    Returns {name: {"seconds": best time, "peak_mb": peak RSS growth of that run}}.
+    """
+    ctx = multiprocessing.get_context("spawn")
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for name in names:
+            # Generate file inputs once, outside the timed runs
+            WORKLOADS[name](settings, work_dir)
+            best = None
+            for _ in range(repeat):
+                with ctx.Pool(1) as pool:
+                    elapsed, peak = pool.apply(_run_workload, ((name, settings, work_dir),))
+                if best is None or elapsed < best[0]:
+                    best = (elapsed, peak)
+            results[name] = {"seconds": round(best[0], 6), "peak_mb": round(best[1], 2)}
+    return results
+
+def git_commit():
+    """Current commit hash (with "-dirty" for local changes), or None outside git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"],
+                               cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+def load_last_record(path):
+    """Last record of a results file, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    last = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                last = json.loads(line)
+    return last
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--only", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS),
+                        help="workloads to run (default: all)")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per workload; best is kept")
+    parser.add_argument("--output", default="benchmark_results.jsonl",
+                        help="results file; one JSON record is appended per run")
+    parser.add_argument("--compare", metavar="RESULTS",
+                        help="print timings relative to the last record in this file")
+    parser.add_argument("--seed", type=int, default=137)
+    parser.add_argument("--cipher-mb", type=int, default=16)
+    parser.add_argument("--stations", type=int, default=500)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--nan", type=float, default=0.05, help="fraction of blank monthly values")
+    parser.add_argument("--koch-sides", type=int, default=4)
+    parser.add_argument("--koch-depth", type=int, default=7)
+    parser.add_argument("--square-size", type=int, default=2000)
+    parser.add_argument("--triangles", type=int, default=200000)
+    return parser.parse_args(argv)
+
+SETTING_NAMES = ("seed", "cipher_mb", "stations", "years", "nan", "koch_sides", "koch_depth",
+                 "square_size", "triangles")
+
+def main(argv=None):
+    args = parse_args(argv)
+    settings = {name: getattr(args, name) for name in SETTING_NAMES}
+    baseline = load_last_record(args.compare) if args.compare else None
+    if baseline and baseline.get("settings") != settings:
+        print("Warning: the comparison run used different settings.")
+
+    results = run_suite(args.only, settings, args.repeat)
+    record = {
+        "commit": git_commit(),
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": settings,
+        "results": results,
+    }
+    with open(args.output, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+
+    print(f"{'workload':<16}{'seconds':>10}{'peak MiB':>10}{'vs. baseline':>14}")
+    for name, result in results.items():
+        ratio = "-"
+        old = (baseline or {}).get("results", {}).get(name)
+        if old:
+            ratio = f"{result['seconds'] / max(old['seconds'], 1e-9):.2f}x"
+        print(f"{name:<16}{result['seconds']:>10.4f}{result['peak_mb']:>10.1f}{ratio:>14}")
+    print(f"Results appended to '{args.output}' (commit {record['commit']}).")
+
+if __name__ == "__main__":
+    main()